@@ -0,0 +1,122 @@
+"""
+Async-native versions of the write endpoints that can wait on the Art Institute API.
+
+Served under an ASGI server (see config/asgi.py), a request waiting on the upstream
+holds no thread, so one process can keep hundreds of them in flight. DRF views are
+synchronous, so these are plain Django views that reuse the DRF serializers and
+return the same payloads as their counterparts in views.py.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from .models import Project
+from .serializers import ProjectAddArtworkSerializer, ProjectCreateSerializer, ProjectSerializer
+from .services import ArtworkService, ProjectArtworkService, ProjectService
+from .views import serialize
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type="application/json")
+
+
+def parse_json(request):
+    """Returns (data, error_response)."""
+    try:
+        return json.loads(request.body or b"null"), None
+    except ValueError as e:
+        return None, json_response({"detail": f"JSON parse error - {e}"}, status.HTTP_400_BAD_REQUEST)
+
+
+@transaction.atomic
+def add_artwork_in_transaction(project, artwork):
+    return ProjectArtworkService.add_artwork_to_project(project=project, artwork=artwork)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncProjectCreateView(View):
+    """
+    POST /api/async/projects/
+    Same contract as POST /api/projects/.
+    """
+
+    async def post(self, request):
+        data, error = parse_json(request)
+        if error:
+            return error
+
+        serializer = ProjectCreateSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        artwork_ids = data["artwork_ids"]
+
+        by_external, fetch_errors = await ArtworkService.aget_artworks(artwork_ids)
+        ordered_artworks = [by_external[aid] for aid in artwork_ids if aid in by_external]
+
+        # The async ORM has no transactions; run the write block in a thread
+        project = await sync_to_async(transaction.atomic(ProjectService.create_project))(
+            name=data["name"],
+            description=data.get("description"),
+            start_date=data.get("start_date"),
+            artworks=ordered_artworks,
+        )
+
+        project = await Project.objects.with_places().aget(pk=project.pk)
+        # In a thread: license texts the process hasn't cached yet are read from the DB
+        response_payload = await sync_to_async(serialize)(ProjectSerializer(project))
+        if fetch_errors:
+            response_payload["fetch_errors"] = fetch_errors
+
+        return json_response(response_payload, status.HTTP_201_CREATED)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncProjectAddArtworkView(View):
+    """
+    POST /api/async/projects/<project_id>/artworks/
+    Same contract as POST /api/projects/<project_id>/artworks/.
+    """
+
+    async def post(self, request, project_id: int):
+        project = await Project.objects.filter(pk=project_id).afirst()
+        if project is None:
+            return json_response({"detail": "No Project matches the given query."}, status.HTTP_404_NOT_FOUND)
+
+        data, error = parse_json(request)
+        if error:
+            return error
+
+        serializer = ProjectAddArtworkSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        external_id = serializer.validated_data["artwork_id"]
+
+        by_external, fetch_errors = await ArtworkService.aget_artworks([external_id])
+        artwork = by_external.get(external_id)
+        if not artwork:
+            return json_response(
+                {
+                    "detail": "Artwork does not exist in third-party API or could not be fetched.",
+                    "errors": fetch_errors,
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            created = await sync_to_async(add_artwork_in_transaction)(project, artwork)
+        except ValueError as e:
+            return json_response(e.args[0], status.HTTP_400_BAD_REQUEST)
+
+        project = await Project.objects.with_places().aget(pk=project.pk)
+        payload = await sync_to_async(serialize)(ProjectSerializer(project))
+        payload["added"] = {"external_id": artwork.external_id, "created_link": created}
+        return json_response(payload, status.HTTP_201_CREATED)
@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Artwork
+
+DEFAULT_ARTWORK_CACHE = {
+    "BACKEND": "api.cache.LocMemArtworkCacheBackend",
+    "OPTIONS": {},
+    "TTL": 60 * 60,
+    "NEGATIVE_TTL": 5 * 60,
+}
+
+
+class LocMemArtworkCacheBackend:
+    """
+    In-process store with per-entry expiry and LRU eviction.
+
+    Cheapest option, but every worker process keeps its own copy.
+    """
+
+    def __init__(self, max_entries=10_000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                result[key] = value
+        return result
+
+    def set_many(self, mapping, timeout):
+        expires_at = time.monotonic() + timeout
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoArtworkCacheBackend:
+    """
+    Store backed by a Django cache alias (settings.CACHES), shared between processes
+    when that alias is. Eviction is left to the underlying cache.
+    """
+
+    def __init__(self, alias="default", key_prefix="artwork"):
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def get_many(self, keys):
+        found = self.cache.get_many([self._key(k) for k in keys])
+        return {k: found[self._key(k)] for k in keys if self._key(k) in found}
+
+    def set_many(self, mapping, timeout):
+        self.cache.set_many({self._key(k): v for k, v in mapping.items()}, timeout)
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self._key(k) for k in keys])
+
+    def clear(self):
+        # Other data may share the alias, so only our own keys can go - and those expire anyway
+        pass
+
+
+class ArtworkCache:
+    """
+    Artwork metadata keyed by external_id, in front of the Artwork table and the upstream API.
+
+    Positive entries hold the Artwork row itself, so a hit costs no DB query.
+    Negative entries remember ids the upstream answered 404 for, so they aren't re-fetched.
+    """
+    NOT_FOUND = {"status_code": 404}
+
+    _field_names = [f.attname for f in Artwork._meta.concrete_fields]
+
+    def __init__(self, backend, ttl, negative_ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def get_many(self, external_ids):
+        """
+        Returns:
+            tuple: (artworks, not_found) where artworks maps external ID -> Artwork
+            and not_found is the list of IDs cached as missing upstream.
+        """
+        artworks = {}
+        not_found = []
+
+        for external_id, value in self.backend.get_many(external_ids).items():
+            if value == self.NOT_FOUND:
+                not_found.append(external_id)
+            else:
+                artworks[external_id] = Artwork.from_db("default", self._field_names, value)
+
+        return artworks, not_found
+
+    def set_artworks(self, artworks):
+        if not artworks:
+            return
+        self.backend.set_many(
+            {a.external_id: [getattr(a, name) for name in self._field_names] for a in artworks},
+            self.ttl,
+        )
+
+    def set_not_found(self, external_ids):
+        if not external_ids:
+            return
+        self.backend.set_many({eid: self.NOT_FOUND for eid in external_ids}, self.negative_ttl)
+
+    def invalidate(self, external_ids):
+        self.backend.delete_many(list(external_ids))
+
+    def clear(self):
+        self.backend.clear()
+
+
+_artwork_cache = None
+_artwork_cache_lock = threading.Lock()
+
+
+def get_artwork_cache() -> ArtworkCache:
+    """Process-wide ArtworkCache configured from settings.ARTWORK_CACHE."""
+    global _artwork_cache
+    if _artwork_cache is None:
+        with _artwork_cache_lock:
+            if _artwork_cache is None:
+                conf = {**DEFAULT_ARTWORK_CACHE, **getattr(settings, "ARTWORK_CACHE", {})}
+                backend = import_string(conf["BACKEND"])(**conf["OPTIONS"])
+                _artwork_cache = ArtworkCache(backend, conf["TTL"], conf["NEGATIVE_TTL"])
+    return _artwork_cache
+
+
+@receiver(setting_changed)
+def _reset_artwork_cache(*, setting, **kwargs):
+    global _artwork_cache
+    if setting in ("ARTWORK_CACHE", "CACHES"):
+        _artwork_cache = None
+
+
+class ProjectResponseCache:
+    """
+    Rendered JSON bodies of project reads, keyed by project version.
+
+    Every write bumps Project.version, which moves readers to new keys; bodies
+    rendered for older versions are never served again and simply expire.
+    """
+
+    def __init__(self, alias="default", timeout=5 * 60, key_prefix="project-response"):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, project_id, version, variant):
+        return f"{self.key_prefix}:{project_id}:{version}:{variant}"
+
+    def get(self, project_id, version, variant):
+        return self.cache.get(self._key(project_id, version, variant))
+
+    def set(self, project_id, version, variant, body):
+        self.cache.set(self._key(project_id, version, variant), body, self.timeout)
+
+
+def get_project_response_cache() -> ProjectResponseCache:
+    conf = getattr(settings, "PROJECT_RESPONSE_CACHE", {})
+    return ProjectResponseCache(**{k.lower(): v for k, v in conf.items()})
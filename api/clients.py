@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import time
+import weakref
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import timed
+from .resilience import CircuitBreaker, TokenBucket, parse_retry_after
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+ARTIC_BASE = "https://api.artic.edu/api/v1/artworks"
+
+
+class ArticClient:
+    """
+    Client for the Art Institute of Chicago artworks API.
+
+    Holds one pooled requests.Session, so TLS connections are reused across calls.
+
+    Calls go through a circuit breaker and a token-bucket rate limiter. While the
+    upstream is failing, or while it asks us to back off with a 429, calls fail
+    fast with errors carrying `retry_after` instead of waiting out the timeout.
+    """
+    # Upstream caps page size (and therefore ids per multi-id request) at 100
+    BATCH_SIZE = 100
+    # Only ask for what we store; license_text comes back in "info" regardless
+    FIELDS = "id,title"
+
+    def __init__(
+        self,
+        base_url=None,
+        timeout=10,
+        connect_timeout=3,
+        pool_size=10,
+        breaker=None,
+        limiter=None,
+        max_queue_wait=2,
+    ):
+        self.base_url = (base_url or getattr(settings, "ARTIC_API_BASE", ARTIC_BASE)).rstrip("/")
+        self.timeout = timeout
+        # A host that doesn't accept connections is down; no need to wait the full read timeout
+        self.connect_timeout = min(connect_timeout, timeout)
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker(name="artic")
+        self.limiter = limiter or TokenBucket()
+        # Longest a call may wait for the rate limiter before failing instead
+        self.max_queue_wait = max_queue_wait
+        self._async_clients = weakref.WeakKeyDictionary()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch_batch(self, ids, max_queue_wait=None):
+        """
+        Fetch up to BATCH_SIZE artworks with a single multi-id request.
+
+        Args:
+            ids: List of artwork external IDs
+            max_queue_wait: Longest wait for the rate limiter, self.max_queue_wait by default
+
+        Returns:
+            tuple: (found, fetch_errors) where found maps external ID -> {"title", "license_text"}.
+            IDs absent from the upstream response are reported with status_code 404.
+        """
+        wait, refused = self._admit(ids, max_queue_wait)
+        if refused:
+            return {}, refused
+        if wait:
+            time.sleep(wait)
+
+        try:
+            with timed("upstream"):
+                r = self.session.get(
+                    self.base_url,
+                    params=self._batch_params(ids),
+                    timeout=(self.connect_timeout, self.timeout),
+                )
+        except requests.RequestException as e:
+            self._settle(None)
+            return {}, [{"id": aid, "error": str(e)} for aid in ids]
+
+        retry_after = self._settle(r.status_code, r.headers.get("Retry-After"))
+        if r.status_code != 200:
+            return {}, self._status_errors(ids, r.status_code, retry_after)
+
+        try:
+            payload = r.json() or {}
+        except ValueError as e:
+            return {}, [{"id": aid, "error": str(e)} for aid in ids]
+
+        return self._parse_batch(ids, payload)
+
+    async def afetch_batch(self, ids):
+        """
+        Async fetch_batch, over a pooled httpx.AsyncClient per event loop.
+        Falls back to running fetch_batch in a thread when httpx isn't installed.
+        """
+        client = self._async_client()
+        if client is None:
+            return await asyncio.to_thread(self.fetch_batch, ids)
+
+        wait, refused = self._admit(ids)
+        if refused:
+            return {}, refused
+        if wait:
+            await asyncio.sleep(wait)
+
+        try:
+            with timed("upstream"):
+                r = await client.get(
+                    self.base_url,
+                    params=self._batch_params(ids),
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                )
+        except httpx.HTTPError as e:
+            self._settle(None)
+            return {}, [{"id": aid, "error": str(e)} for aid in ids]
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+
+        retry_after = self._settle(r.status_code, r.headers.get("Retry-After"))
+        if r.status_code != 200:
+            return {}, self._status_errors(ids, r.status_code, retry_after)
+
+        try:
+            payload = r.json() or {}
+        except ValueError as e:
+            return {}, [{"id": aid, "error": str(e)} for aid in ids]
+
+        return self._parse_batch(ids, payload)
+
+    def _admit(self, ids, max_queue_wait=None):
+        """
+        Ask the breaker and the rate limiter for permission to call.
+
+        Returns:
+            tuple: (seconds to wait before calling, None), or (None, fetch_errors) if refused
+        """
+        if not self.breaker.allow():
+            return None, [
+                {"id": aid, "error": "Art Institute API is unavailable.", "retry_after": round(self.breaker.retry_after(), 1)}
+                for aid in ids
+            ]
+
+        wait = self.limiter.reserve(self.max_queue_wait if max_queue_wait is None else max_queue_wait)
+        if wait is None:
+            self.breaker.release()
+            return None, [
+                {"id": aid, "error": "Art Institute API rate limit reached.", "retry_after": round(self.limiter.retry_after(), 1)}
+                for aid in ids
+            ]
+        return wait, None
+
+    def _settle(self, status_code, retry_after_header=None):
+        """
+        Report a call's outcome (status_code None: no response) to the breaker and the limiter.
+
+        Returns:
+            float | None: Seconds the upstream asked us to back off for, on a 429
+        """
+        if status_code == 429:
+            retry_after = parse_retry_after(retry_after_header)
+            self.limiter.throttle(retry_after)
+            # Overloaded rather than broken: neither a success nor a failure for the breaker
+            self.breaker.release()
+            return retry_after
+
+        if status_code is None or status_code >= 500:
+            self.breaker.record(False)
+        else:
+            self.breaker.record(True)
+            self.limiter.recover()
+        return None
+
+    @staticmethod
+    def _status_errors(ids, status_code, retry_after=None):
+        error = {"status_code": status_code}
+        if retry_after is not None:
+            error["retry_after"] = retry_after
+        return [{"id": aid, **error} for aid in ids]
+
+    def _batch_params(self, ids):
+        return {
+            "ids": ",".join(str(aid) for aid in ids),
+            "fields": self.FIELDS,
+            "limit": len(ids),
+        }
+
+    def _parse_batch(self, ids, payload):
+        found = {}
+        fetch_errors = []
+
+        info = payload.get("info") or {}
+        license_text = info.get("license_text") or ""
+
+        for item in payload.get("data") or []:
+            aid = item.get("id")
+            if aid is None:
+                continue
+            found[int(aid)] = {"title": item.get("title") or "", "license_text": license_text}
+
+        for aid in ids:
+            if aid not in found:
+                fetch_errors.append({"id": aid, "status_code": 404})
+
+        return found, fetch_errors
+
+    def _async_client(self):
+        if httpx is None:
+            return None
+
+        # httpx clients are bound to the event loop they were first used on
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(limits=httpx.Limits(max_connections=self.pool_size))
+            self._async_clients[loop] = client
+        return client
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_artic_client() -> ArticClient:
+    """
+    Process-wide ArticClient, created on first use, with the breaker and rate limiter
+    configured from settings.ARTIC_CIRCUIT_BREAKER and settings.ARTIC_RATE_LIMIT.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                breaker = {k.lower(): v for k, v in getattr(settings, "ARTIC_CIRCUIT_BREAKER", {}).items()}
+                limit = {k.lower(): v for k, v in getattr(settings, "ARTIC_RATE_LIMIT", {}).items()}
+                max_queue_wait = limit.pop("max_queue_wait", 2)
+                _client = ArticClient(
+                    breaker=CircuitBreaker(name="artic", **breaker),
+                    limiter=TokenBucket(**limit),
+                    max_queue_wait=max_queue_wait,
+                )
+    return _client
+
+
+@receiver(setting_changed)
+def _reset_artic_client(*, setting, **kwargs):
+    global _client
+    if setting in ("ARTIC_API_BASE", "ARTIC_CIRCUIT_BREAKER", "ARTIC_RATE_LIMIT"):
+        _client = None
@@ -0,0 +1,64 @@
+"""
+Streaming exports of every project with its places, for bulk consumers such as analytics.
+
+Both formats are produced chunk by chunk from fast_serializers.iter_projects_data, so
+memory use doesn't grow with the number of projects.
+
+ndjson: one ProjectSerializer payload per line, the same JSON as the detail endpoint.
+csv:    one row per place, with its project's columns repeated; a project without
+        places gets one row with the place columns empty.
+"""
+import csv
+import io
+from itertools import islice
+
+from . import fast_serializers
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+_PROJECT_COLUMNS = [f for f in fast_serializers.PROJECT_FIELDS if f != "artworks"]
+_PLACE_COLUMNS = [f for f in fast_serializers.PLACE_FIELDS if f != "artwork"]
+
+CSV_HEADER = [
+    *(f"project_{f}" for f in _PROJECT_COLUMNS),
+    *(f"artwork_{f}" for f in fast_serializers.ARTWORK_FIELDS),
+    *_PLACE_COLUMNS,
+]
+
+
+def _ndjson_chunk(projects):
+    return b"".join(fast_serializers.render_json(project) + b"\n" for project in projects)
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_rows(project):
+    head = [project[f] for f in _PROJECT_COLUMNS]
+    if not project["artworks"]:
+        yield head + [None] * (len(CSV_HEADER) - len(head))
+    for place in project["artworks"]:
+        yield head + [place["artwork"][f] for f in fast_serializers.ARTWORK_FIELDS] + [place[f] for f in _PLACE_COLUMNS]
+
+
+def _csv_chunk(projects):
+    return _csv_lines(row for project in projects for row in _csv_rows(project))
+
+
+def export_projects(output_format, chunk_size=1000):
+    """Yield the export as bytes, one piece per chunk of projects."""
+    if output_format == "csv":
+        yield _csv_lines([CSV_HEADER])
+        render = _csv_chunk
+    else:
+        render = _ndjson_chunk
+
+    projects = fast_serializers.iter_projects_data(chunk_size=chunk_size)
+    while chunk := list(islice(projects, chunk_size)):
+        yield render(chunk)
@@ -0,0 +1,190 @@
+"""
+Read-path serializers that skip DRF and model instances.
+
+They build the exact payloads of ProjectSerializer / ProjectArtworkSerializer straight
+from values_list() rows, and render_json() produces the same bytes as DRF's JSONRenderer
+with the default settings (compact, UTF-8, U+2028/U+2029 escaped). Field lists come from
+the DRF serializers, so the two stay in step; api.tests checks their output is identical.
+
+Only fields that serialize as the raw column value (or a date) are supported here, plus
+the artwork's license_text, which is read as license_id and resolved through api.licenses:
+adding a computed or nested field to those serializers means adding it here too.
+
+With compact=True, artworks carry license_id instead, like ArtworkSerializer with
+context["compact"].
+
+Like every read of artworks, building places queues background refreshes for the stale
+ones (see ArtworkHydrationService); their freshness is read in the same query.
+"""
+import json
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+
+from django.http import Http404
+
+from .instrumentation import timed
+from .licenses import license_text
+from .models import Project, ProjectArtwork
+from .serializers import ArtworkSerializer, ProjectArtworkSerializer, ProjectSerializer
+from .services import ArtworkHydrationService
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ARTWORK_FIELDS = tuple(ArtworkSerializer.Meta.fields)
+PLACE_FIELDS = tuple(ProjectArtworkSerializer.Meta.fields)
+PROJECT_FIELDS = tuple(ProjectSerializer.Meta.fields)
+
+# Columns selected for one place: its own fields, then its artwork's, then its artwork's
+# freshness, which isn't serialized
+_PLACE_OWN = tuple(f for f in PLACE_FIELDS if f != "artwork")
+_ARTWORK_COLUMNS = tuple("license_id" if f == "license_text" else f for f in ARTWORK_FIELDS)
+_FRESHNESS_COLUMNS = ("artwork_id", "artwork__status", "artwork__fetched_at")
+_PLACE_COLUMNS = (*_PLACE_OWN, *(f"artwork__{c}" for c in _ARTWORK_COLUMNS), *_FRESHNESS_COLUMNS)
+_PROJECT_COLUMNS = tuple(f for f in PROJECT_FIELDS if f != "artworks")
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def _column_getter(model, name, index):
+    """Getter for one row column, converted the way DRF's field for it would."""
+    get = itemgetter(index)
+    if model._meta.get_field(name).get_internal_type() == "DateField":
+        return lambda row: _isoformat(get(row))
+    return get
+
+
+def _compile_artwork(compact):
+    """Precompile a function turning the artwork columns of a _PLACE_COLUMNS row into the ArtworkSerializer dict."""
+    artwork_columns = slice(len(_PLACE_OWN), len(_PLACE_OWN) + len(_ARTWORK_COLUMNS))
+    if compact:
+        return lambda row: dict(zip(_ARTWORK_COLUMNS, row[artwork_columns]))
+
+    def build(row):
+        artwork = dict(zip(ARTWORK_FIELDS, row[artwork_columns]))
+        artwork["license_text"] = license_text(artwork["license_text"])
+        return artwork
+
+    return build
+
+
+def _compile_place(compact=False):
+    """Precompile a function turning one _PLACE_COLUMNS row into the ProjectArtworkSerializer dict."""
+    build_artwork = _compile_artwork(compact)
+    getters = [
+        (name, build_artwork if name == "artwork" else _column_getter(ProjectArtwork, name, _PLACE_OWN.index(name)))
+        for name in PLACE_FIELDS
+    ]
+
+    def build(row):
+        return {name: get(row) for name, get in getters}
+
+    return build
+
+
+def _compile_project():
+    """Precompile a function turning a _PROJECT_COLUMNS row and its places into the ProjectSerializer dict."""
+    getters = [
+        (name, None if name == "artworks" else _column_getter(Project, name, _PROJECT_COLUMNS.index(name)))
+        for name in PROJECT_FIELDS
+    ]
+
+    def build(row, places):
+        return {name: places if get is None else get(row) for name, get in getters}
+
+    return build
+
+
+_build_place = _compile_place()
+_build_compact_place = _compile_place(compact=True)
+_build_project = _compile_project()
+
+
+def _places(queryset):
+    return queryset.order_by("id").values_list(*_PLACE_COLUMNS)
+
+
+def _refresh_stale(rows):
+    """Queue refreshes for the stale artworks of these _PLACE_COLUMNS rows; no query unless there are some."""
+    cutoff = ArtworkHydrationService.refresh_cutoff()
+    stale = {row[-3] for row in rows if ArtworkHydrationService.is_stale(row[-2], row[-1], cutoff)}
+    if stale:
+        ArtworkHydrationService.enqueue_refresh(list(stale))
+
+
+def _not_found(model):
+    # Same message as get_object_or_404, so 404 bodies match the DRF path too
+    return Http404(f"No {model._meta.object_name} matches the given query.")
+
+
+def project_data(project_id, compact=False):
+    """ProjectSerializer(project).data for one project; Http404 if it doesn't exist. Two queries."""
+    row = Project.objects.filter(pk=project_id).values_list(*_PROJECT_COLUMNS).first()
+    if row is None:
+        raise _not_found(Project)
+    rows = list(_places(ProjectArtwork.objects.filter(project_id=project_id)))
+    _refresh_stale(rows)
+    build_place = _build_compact_place if compact else _build_place
+    with timed("serialize"):
+        return _build_project(row, [build_place(r) for r in rows])
+
+
+def places_data(project_id, compact=False):
+    """ProjectArtworkSerializer(places, many=True).data for a project's places. One query."""
+    rows = list(_places(ProjectArtwork.objects.filter(project_id=project_id)))
+    _refresh_stale(rows)
+    build_place = _build_compact_place if compact else _build_place
+    with timed("serialize"):
+        return [build_place(r) for r in rows]
+
+
+def place_data(project_id, artwork_external_id, compact=False):
+    """ProjectArtworkSerializer(place).data for one place; Http404 if it doesn't exist. One query."""
+    row = _places(
+        ProjectArtwork.objects.filter(project_id=project_id, artwork__external_id=artwork_external_id)
+    ).first()
+    if row is None:
+        raise _not_found(ProjectArtwork)
+    _refresh_stale([row])
+    build_place = _build_compact_place if compact else _build_place
+    with timed("serialize"):
+        return build_place(row)
+
+
+def iter_projects_data(chunk_size=1000):
+    """
+    ProjectSerializer data for every project, by id, without loading them all.
+
+    Projects are read through a server-side cursor where the backend has one, and the
+    places of each chunk of projects are fetched in one query, so memory stays flat.
+    """
+    id_index = _PROJECT_COLUMNS.index("id")
+    rows = Project.objects.order_by("id").values_list(*_PROJECT_COLUMNS).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        place_rows = (
+            ProjectArtwork.objects
+            .filter(project_id__in=[row[id_index] for row in chunk])
+            .order_by("project_id", "id")
+            .values_list(*_PLACE_COLUMNS, "project_id")
+        )
+        places = defaultdict(list)
+        for place in place_rows:
+            places[place[-1]].append(_build_place(place))
+        _refresh_stale([place[:-1] for place in place_rows])
+        for row in chunk:
+            yield _build_project(row, places[row[id_index]])
+
+
+def render_json(data) -> bytes:
+    """Same bytes as rest_framework.renderers.JSONRenderer().render(data) with default settings."""
+    if orjson is not None:
+        body = orjson.dumps(data)
+        return body.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    return body.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
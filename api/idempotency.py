@@ -0,0 +1,210 @@
+"""
+Idempotency-Key support for write endpoints.
+
+A client sends a unique Idempotency-Key header with a POST and reuses it when retrying.
+The first request with a key claims it in the IdempotencyKey table and runs; a
+successful response is stored and replayed to every retry until the key expires,
+without running the view again. A retry arriving while the first request is still
+running waits for its response. Other responses are not stored: failed writes in this
+API change nothing, so a retry after one runs the request again.
+
+The claim is committed before the view runs, so every process sees it. If a process
+dies while holding a key, the claim lapses after LOCK_TIMEOUT and a retry runs the
+request again.
+"""
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+DEFAULT_IDEMPOTENCY = {
+    # How long a stored response is replayed
+    "TTL": 24 * 60 * 60,
+    # A request holding a key longer than this is presumed dead
+    "LOCK_TIMEOUT": 60,
+    # How long a duplicate waits for the original request before giving up with 409
+    "WAIT": 15,
+    "POLL_INTERVAL": 0.1,
+}
+
+
+def get_idempotency_settings():
+    return {**DEFAULT_IDEMPOTENCY, **getattr(settings, "IDEMPOTENCY", {})}
+
+
+def error_response(detail, status_code, headers=None):
+    return HttpResponse(
+        json.dumps({"detail": detail}),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+class IdempotentRequest:
+    """One request carrying an Idempotency-Key, from claiming the key to storing the response."""
+
+    def __init__(self, request, key):
+        self.key = key
+        self.path = request.path
+        self.fingerprint = hashlib.sha256(f"{request.method} {request.path}\n".encode() + request.body).hexdigest()
+        self.owner = uuid.uuid4().hex
+        self.conf = get_idempotency_settings()
+        self.deadline = time.monotonic() + self.conf["WAIT"]
+
+    def poll(self):
+        """
+        Try to claim the key.
+
+        Returns:
+            tuple: (claimed, response). If not claimed, response is the one to send
+            instead of running the view, or None to poll again later.
+        """
+        now = timezone.now()
+        # Expired keys, and keys whose request died, are free again
+        IdempotencyKey.objects.filter(key=self.key, path=self.path).filter(
+            Q(expires_at__lte=now) | Q(status_code__isnull=True, locked_until__lte=now)
+        ).delete()
+        try:
+            # Savepoint, so a taken key doesn't break an enclosing transaction
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    key=self.key,
+                    path=self.path,
+                    fingerprint=self.fingerprint,
+                    owner=self.owner,
+                    locked_until=now + timedelta(seconds=self.conf["LOCK_TIMEOUT"]),
+                    expires_at=now + timedelta(seconds=self.conf["TTL"]),
+                )
+            return True, None
+        except IntegrityError:
+            pass
+
+        row = IdempotencyKey.objects.filter(key=self.key, path=self.path).first()
+        if row is None:
+            # Released in the meantime
+            return False, None
+        if row.fingerprint != self.fingerprint:
+            return False, error_response(
+                f"This {HEADER} was already used for a different request.",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if row.status_code is not None:
+            return False, HttpResponse(
+                bytes(row.body),
+                status=row.status_code,
+                content_type=row.content_type,
+                headers={"Idempotent-Replayed": "true"},
+            )
+        if time.monotonic() >= self.deadline:
+            return False, error_response(
+                f"A request with this {HEADER} is still being processed.",
+                status.HTTP_409_CONFLICT,
+                headers={"Retry-After": "1"},
+            )
+        return False, None
+
+    def finish(self, response):
+        """Store a successful response for replay; release the key otherwise."""
+        claim = IdempotencyKey.objects.filter(key=self.key, path=self.path, owner=self.owner)
+        if not status.is_success(response.status_code) or getattr(response, "streaming", False):
+            claim.delete()
+            return
+        if hasattr(response, "render"):
+            response.render()
+        claim.update(
+            status_code=response.status_code,
+            content_type=response.get("Content-Type", ""),
+            body=response.content,
+        )
+
+    def release(self):
+        IdempotencyKey.objects.filter(key=self.key, path=self.path, owner=self.owner).delete()
+
+
+def idempotent(view):
+    """
+    Make a view function honour Idempotency-Key on POST; see the module docstring.
+
+    Wraps sync and async views alike, e.g. the result of as_view() in a URLconf.
+    """
+
+    def begin(request):
+        """(IdempotentRequest, None) to go ahead, (None, response) to answer directly, (None, None) to bypass."""
+        key = request.headers.get(HEADER)
+        if request.method != "POST" or key is None:
+            return None, None
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return None, error_response(
+                f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.",
+                status.HTTP_400_BAD_REQUEST,
+            )
+        return IdempotentRequest(request, key), None
+
+    if iscoroutinefunction(view):
+        async def wrapper(request, *args, **kwargs):
+            idempotent_request, response = begin(request)
+            if response is not None:
+                return response
+            if idempotent_request is None:
+                return await view(request, *args, **kwargs)
+
+            while True:
+                claimed, response = await sync_to_async(idempotent_request.poll)()
+                if claimed:
+                    break
+                if response is not None:
+                    return response
+                await asyncio.sleep(idempotent_request.conf["POLL_INTERVAL"])
+
+            try:
+                response = await view(request, *args, **kwargs)
+            except BaseException:
+                await sync_to_async(idempotent_request.release)()
+                raise
+            await sync_to_async(idempotent_request.finish)(response)
+            return response
+
+        return markcoroutinefunction(wraps(view)(wrapper))
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        idempotent_request, response = begin(request)
+        if response is not None:
+            return response
+        if idempotent_request is None:
+            return view(request, *args, **kwargs)
+
+        while True:
+            claimed, response = idempotent_request.poll()
+            if claimed:
+                break
+            if response is not None:
+                return response
+            time.sleep(idempotent_request.conf["POLL_INTERVAL"])
+
+        try:
+            response = view(request, *args, **kwargs)
+        except BaseException:
+            idempotent_request.release()
+            raise
+        idempotent_request.finish(response)
+        return response
+
+    return wrapper
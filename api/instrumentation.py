@@ -0,0 +1,284 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware gives every request a RequestMetrics in a context variable.
+Code on the request's path adds to it: DB queries through an execute wrapper
+installed on every connection, upstream calls and serialization through timed().
+Context variables follow sync_to_async and asyncio tasks; thread pools must run
+their work in a copy of the context (see ArtworkService.fetch_missing_artworks).
+
+Each request then gets a Server-Timing header, a structured log line, and is added
+to the per-view histograms served at /metrics in the Prometheus text format.
+Metrics are per process; scrape each worker, or sum them downstream.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+logger = logging.getLogger("api.performance")
+
+DEFAULT_PERFORMANCE = {
+    "SERVER_TIMING": True,
+    "LOG_REQUESTS": True,
+    # Requests slower than this log their slowest queries; None disables it
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_QUERY_LIMIT": 10,
+}
+
+# Queries kept per request for the slow-request dump
+MAX_RECORDED_QUERIES = 200
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def get_performance_settings():
+    return {**DEFAULT_PERFORMANCE, **getattr(settings, "PERFORMANCE", {})}
+
+
+class RequestMetrics:
+    """Timings of one request, by category: name -> [count, seconds]."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = defaultdict(lambda: [0, 0.0])
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, sql=None):
+        with self._lock:
+            timing = self.timings[name]
+            timing[0] += 1
+            timing[1] += seconds
+            if sql is not None and len(self.queries) < MAX_RECORDED_QUERIES:
+                self.queries.append((seconds, sql))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def current_metrics():
+    """The RequestMetrics of the request being handled, or None outside of one."""
+    return _current.get()
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's `name` timing."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, time.perf_counter() - started)
+
+
+def query_timer(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record("db", time.perf_counter() - started, sql=sql)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver: time every query made on the new connection."""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+class Histogram:
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames, buckets=BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += 1
+        series[2] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (buckets, count, total) in sorted(self._series.items()):
+            label_text = format_labels(self.labelnames, labels)
+            for bound, bucket_count in zip(self.buckets, buckets):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series = defaultdict(float)
+
+    def inc(self, labels, value=1):
+        self._series[labels] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{{{format_labels(self.labelnames, labels)}}} {value}")
+        return lines
+
+
+def format_labels(names, values):
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter("http_requests_total", "Requests handled.", ("view", "method", "status"))
+        self.duration = Histogram("http_request_duration_seconds", "Request latency.", ("view", "method"))
+        self.db_queries = Histogram(
+            "http_request_db_queries",
+            "DB queries per request.",
+            ("view", "method"),
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+        )
+        self.seconds = Counter(
+            "http_request_component_seconds_total",
+            "Time spent per component (db, upstream, serialize).",
+            ("view", "component"),
+        )
+        self.calls = Counter(
+            "http_request_component_calls_total",
+            "Calls per component (db queries, upstream requests, serializations).",
+            ("view", "component"),
+        )
+
+    def observe(self, view, method, status, elapsed, metrics):
+        with self._lock:
+            self.requests.inc((view, method, str(status)))
+            self.duration.observe((view, method), elapsed)
+            self.db_queries.observe((view, method), metrics.timings["db"][0] if "db" in metrics.timings else 0)
+            for name, (count, seconds) in metrics.timings.items():
+                self.calls.inc((view, name), count)
+                self.seconds.inc((view, name), seconds)
+
+    def expose(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.duration, self.db_queries, self.calls, self.seconds):
+                lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class PerformanceMiddleware:
+    """Measures each request; see the module docstring."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        elapsed = metrics.elapsed()
+        conf = get_performance_settings()
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name if match else None) or "unmatched"
+
+        registry.observe(view, request.method, response.status_code, elapsed, metrics)
+
+        if conf["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(metrics, elapsed)
+
+        if conf["LOG_REQUESTS"]:
+            logger.info(json.dumps({
+                "event": "request",
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+                **{
+                    f"{name}_{key}": value
+                    for name, (count, seconds) in metrics.timings.items()
+                    for key, value in (("count", count), ("ms", round(seconds * 1000, 2)))
+                },
+            }))
+
+        slow_ms = conf["SLOW_REQUEST_MS"]
+        if slow_ms is not None and elapsed * 1000 >= slow_ms:
+            slowest = sorted(metrics.queries, key=lambda q: q[0], reverse=True)[:conf["SLOW_QUERY_LIMIT"]]
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "duration_ms": round(elapsed * 1000, 2),
+                "queries": [{"ms": round(seconds * 1000, 2), "sql": sql[:1000]} for seconds, sql in slowest],
+            }))
+
+        return response
+
+
+def server_timing(metrics, elapsed):
+    """Server-Timing header value: one entry per component, plus the total."""
+    entries = [
+        f'{name};dur={seconds * 1000:.2f};desc="{count} calls"'
+        for name, (count, seconds) in sorted(metrics.timings.items())
+    ]
+    entries.append(f"total;dur={elapsed * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def metrics_view(request):
+    """GET /metrics - Prometheus text exposition of this process's request metrics."""
+    return HttpResponse(registry.expose(), content_type="text/plain; version=0.0.4; charset=utf-8")
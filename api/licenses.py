@@ -0,0 +1,75 @@
+"""
+License texts, stored once each in the License table and interned in-process.
+
+Artworks reference their license by id, the sha256 of its text. Since an id can only
+ever stand for one text, texts are cached per process with no invalidation: reads
+resolve ids from memory and only query for ids this process hasn't seen yet. Distinct
+texts are few, but the cache is bounded all the same.
+"""
+import hashlib
+import threading
+
+from .models import License
+
+MAX_CACHED = 10_000
+
+_texts = {}  # license id -> text
+_lock = threading.Lock()
+
+
+def license_id(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _remember(texts):
+    with _lock:
+        if len(_texts) + len(texts) > MAX_CACHED:
+            _texts.clear()
+        _texts.update(texts)
+
+
+def license_for(text):
+    """Unsaved License for a text, None for no text. save_licenses() stores it."""
+    if not text:
+        return None
+    license = License(id=license_id(text), text=text)
+    _remember({license.id: text})
+    return license
+
+
+def save_licenses(licenses):
+    """Insert the given Licenses (None entries are skipped) unless already stored. One query."""
+    unique = {license.id: license for license in licenses if license is not None}
+    if unique:
+        License.objects.bulk_create(unique.values(), ignore_conflicts=True)
+
+
+async def asave_licenses(licenses):
+    unique = {license.id: license for license in licenses if license is not None}
+    if unique:
+        await License.objects.abulk_create(unique.values(), ignore_conflicts=True)
+
+
+def license_texts(ids):
+    """
+    Returns:
+        dict: license id -> text, for those of the ids that exist
+    """
+    ids = {i for i in ids if i is not None}
+    found = {i: _texts[i] for i in ids if i in _texts}
+    missing = ids - found.keys()
+    if missing:
+        loaded = dict(License.objects.filter(id__in=missing).values_list("id", "text"))
+        _remember(loaded)
+        found.update(loaded)
+    return found
+
+
+def license_text(license_id) -> str:
+    """Text of one license; "" for None."""
+    if license_id is None:
+        return ""
+    text = _texts.get(license_id)
+    if text is None:
+        text = license_texts([license_id]).get(license_id, "")
+    return text
@@ -0,0 +1,32 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.export import export_projects
+
+
+class Command(BaseCommand):
+    help = "Write every project with its places as NDJSON or CSV, streaming, to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", dest="output_format")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Projects read (and places prefetched) per query")
+
+    def handle(self, *args, output_format, output, chunk_size, **options):
+        started = time.monotonic()
+        written = 0
+        out = open(output, "wb") if output else sys.stdout.buffer
+        try:
+            for piece in export_projects(output_format, chunk_size=chunk_size):
+                out.write(piece)
+                written += len(piece)
+        finally:
+            if output:
+                out.close()
+            else:
+                out.flush()
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(f"Exported {written / 1e6:,.1f} MB in {elapsed:.1f}s.")
@@ -0,0 +1,74 @@
+import threading
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.services import ArtworkHydrationService
+
+
+class Command(BaseCommand):
+    help = "Run a pool of workers that fill in pending placeholder artworks from the Art Institute API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Worker threads")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ArtworkHydrationService.BATCH_SIZE,
+            help="Jobs claimed (and fetched in one upstream request) per round",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once no jobs are due instead of polling")
+
+    def handle(self, *args, workers, batch_size, poll_interval, once, **options):
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.totals = [0, 0, 0]
+
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(batch_size, poll_interval, once),
+                name=f"hydrate-{i}",
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for t in threads:
+            t.start()
+
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the current batches...")
+            self.stop.set()
+            for t in threads:
+                t.join()
+
+        hydrated, retried, failed = self.totals
+        self.stdout.write(self.style.SUCCESS(f"Hydrated {hydrated}, scheduled {retried} retries, failed {failed}."))
+
+    def work(self, batch_size, poll_interval, once):
+        owner = uuid.uuid4().hex
+        try:
+            while not self.stop.is_set():
+                jobs = ArtworkHydrationService.claim(owner, limit=batch_size)
+                if not jobs:
+                    if once:
+                        return
+                    self.stop.wait(poll_interval)
+                    continue
+
+                counts = ArtworkHydrationService.run(jobs)
+                with self.lock:
+                    self.totals = [a + b for a, b in zip(self.totals, counts)]
+                self.stdout.write(
+                    f"[{owner[:8]}] {len(jobs)} jobs: {counts[0]} hydrated, {counts[1]} retrying, {counts[2]} failed"
+                )
+        finally:
+            # Each worker thread has its own connection; don't leave it open when the thread ends
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
@@ -0,0 +1,213 @@
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.cache import get_artwork_cache
+from api.clients import get_artic_client
+from api.licenses import license_for, save_licenses
+from api.models import Artwork, ArtworkHydrationJob
+from api.services import ProjectService
+
+
+def iter_json_array(fp, read_size=1 << 16):
+    """Yield the elements of a top-level JSON array without reading the whole file."""
+    decoder = json.JSONDecoder()
+    buf = fp.read(read_size)
+    pos = 0
+    eof = not buf
+
+    def fill():
+        nonlocal buf, pos, eof
+        more = fp.read(read_size)
+        eof = not more
+        buf = buf[pos:] + more
+        pos = 0
+
+    opened = False
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (opened and buf[pos] == ",")):
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise CommandError("Unexpected end of file inside JSON array.")
+            fill()
+            continue
+
+        if not opened:
+            if buf[pos] != "[":
+                raise CommandError("Expected a JSON array.")
+            opened = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError(f"Invalid JSON near: {buf[pos:pos + 80]!r}")
+            fill()
+            continue
+        if end == len(buf) and not eof:
+            # A value ending exactly at the buffer edge may be cut short (e.g. a number)
+            fill()
+            continue
+
+        yield obj
+        pos = end
+
+
+def iter_records(path: Path):
+    """
+    Yield raw records from a .jsonl/.ndjson file, a .json file (array, single artwork,
+    or an API page with a "data" list), or a directory of such .json files (the catalog dump).
+    """
+    if path.is_dir():
+        for child in sorted(path.glob("*.json")):
+            yield from iter_records(child)
+        return
+
+    with path.open(encoding="utf-8") as fp:
+        if path.suffix in (".jsonl", ".ndjson"):
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        head = fp.read(1)
+        while head and head.isspace():
+            head = fp.read(1)
+        fp.seek(0)
+
+        if head == "[":
+            yield from iter_json_array(fp)
+        else:
+            # Single-object files are small: one artwork, or one API page
+            payload = json.load(fp)
+            if isinstance(payload.get("data"), list):
+                license_text = (payload.get("info") or {}).get("license_text")
+                for item in payload["data"]:
+                    yield {**item, "license_text": license_text} if license_text else item
+            else:
+                yield payload
+
+
+def to_artwork(record, default_license_text):
+    """Build an Artwork from a catalog record, or return None if it has no id."""
+    if isinstance(record.get("data"), dict):
+        # Single-artwork API response: {"data": {...}, "info": {...}}
+        record = {**record["data"], "license_text": (record.get("info") or {}).get("license_text")}
+
+    external_id = record.get("external_id", record.get("id"))
+    if external_id is None:
+        return None
+
+    external_id = int(external_id)
+    return Artwork(
+        external_id=external_id,
+        title=(record.get("title") or f"Artwork {external_id}")[:500],
+        license=license_for(record.get("license_text") or default_license_text),
+        status=Artwork.Status.READY,
+        fetched_at=timezone.now(),
+    )
+
+
+def chunked(iterable, size):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk insert/update Artwork rows from a local catalog dump (JSON, JSONL or a directory of "
+        "JSON files), or from an id list resolved through the batched Art Institute API."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("path", nargs="?", type=Path, help="Catalog file or directory (no network needed)")
+        source.add_argument("--ids", type=Path, help="File of artwork ids (whitespace/comma separated) to fetch")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per bulk upsert")
+        parser.add_argument("--license-text", default="", help="License text for records that carry none")
+
+    def handle(self, *args, path, ids, chunk_size, license_text, **options):
+        if path is not None:
+            if not path.exists():
+                raise CommandError(f"{path} does not exist.")
+            artworks = (to_artwork(r, license_text) for r in iter_records(path))
+            artworks = (a for a in artworks if a is not None)
+        else:
+            artworks = self.fetch(ids, license_text)
+
+        started = time.monotonic()
+        total = 0
+        for chunk in chunked(artworks, chunk_size):
+            self.upsert(chunk)
+            total += len(chunk)
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{total} artworks imported ({total / elapsed:,.0f}/s)")
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} artworks in {elapsed:.1f}s ({rate:,.0f}/s)."))
+
+    def fetch(self, ids_path, default_license_text):
+        if not ids_path.exists():
+            raise CommandError(f"{ids_path} does not exist.")
+
+        def iter_ids():
+            with ids_path.open() as fp:
+                for number, line in enumerate(fp, 1):
+                    for token in line.replace(",", " ").split():
+                        try:
+                            yield int(token)
+                        except ValueError:
+                            raise CommandError(f"{ids_path}:{number}: {token!r} is not an artwork id.")
+
+        client = get_artic_client()
+        for batch in chunked(iter_ids(), client.BATCH_SIZE):
+            found, fetch_errors = client.fetch_batch(batch)
+            for error in fetch_errors:
+                self.stderr.write(f"Could not fetch {error['id']}: {error.get('status_code') or error.get('error')}")
+            for aid, data in found.items():
+                yield to_artwork({"id": aid, **data}, default_license_text)
+
+    @staticmethod
+    def upsert(chunk):
+        # Later records win within a chunk, like they would across chunks
+        chunk = list({a.external_id: a for a in chunk}.values())
+        external_ids = [a.external_id for a in chunk]
+
+        with transaction.atomic():
+            # Only artworks whose metadata changes make their projects' responses out of date
+            current = {
+                row[0]: row[1:]
+                for row in Artwork.objects.filter(external_id__in=external_ids).values_list(
+                    "external_id", "title", "license_id", "status",
+                )
+            }
+            changed = [
+                a.external_id for a in chunk
+                if a.external_id in current and current[a.external_id] != (a.title, a.license_id, a.status)
+            ]
+
+            save_licenses(a.license for a in chunk)
+            Artwork.objects.bulk_create(
+                chunk,
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=["title", "license", "status", "fetched_at"],
+            )
+            # Imported rows are complete; placeholders waiting on the worker no longer need it
+            ArtworkHydrationJob.objects.filter(artwork__external_id__in=external_ids).delete()
+            if changed:
+                ProjectService.touch_for_artworks(Artwork.objects.filter(external_id__in=changed))
+
+        get_artwork_cache().invalidate(external_ids)
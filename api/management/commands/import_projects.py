@@ -0,0 +1,48 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.management.commands.import_artworks import chunked, iter_records
+from api.serializers import ProjectCreateSerializer, validate_each
+from api.services import ProjectService
+
+
+class Command(BaseCommand):
+    help = (
+        "Create projects from a JSON array or NDJSON file of project definitions (as for "
+        "POST /api/projects/). Invalid definitions are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="JSON array (.json) or NDJSON (.ndjson/.jsonl) file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Projects validated and created together; their artworks are resolved in one pass",
+        )
+
+    def handle(self, *args, path, chunk_size, **options):
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+
+        started = time.monotonic()
+        offset = created = failed = 0
+        for chunk in chunked(iter_records(path), chunk_size):
+            valid, errors = validate_each(ProjectCreateSerializer, chunk)
+            results = ProjectService.bulk_create_projects([data for _, data in valid])
+
+            for error in errors:
+                self.stderr.write(f"Item {offset + error['index']}: {json.dumps(error['errors'])}")
+            for (index, _), (project, fetch_errors) in zip(valid, results):
+                for fetch_error in fetch_errors:
+                    self.stderr.write(f"Item {offset + index} (project {project.pk}): artwork {json.dumps(fetch_error)}")
+
+            offset += len(chunk)
+            created += len(results)
+            failed += len(errors)
+            self.stdout.write(f"{offset} processed, {created} created ({created / (time.monotonic() - started):,.0f}/s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} projects, skipped {failed} invalid."))
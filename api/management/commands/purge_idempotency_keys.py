@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key records; run it periodically, e.g. daily from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=10_000, help="Rows deleted per statement")
+
+    def handle(self, *args, chunk_size, **options):
+        deleted = 0
+        while True:
+            # In chunks, so a large backlog doesn't hold one long write transaction
+            expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list("pk", flat=True)[:chunk_size]
+            count, _ = IdempotencyKey.objects.filter(pk__in=list(expired)).delete()
+            deleted += count
+            if count < chunk_size:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys."))
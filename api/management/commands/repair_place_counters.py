@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from api.models import Project
+from api.services import ProjectService
+
+COUNTER_FIELDS = ["places_count", "visited_count", "is_completed"]
+
+
+def with_actual_counts(qs):
+    return qs.annotate(
+        actual_places=Count("project_artworks"),
+        actual_visited=Count("project_artworks", filter=Q(project_artworks__visited=True)),
+    ).only("pk", *COUNTER_FIELDS)
+
+
+def fix_counters(project) -> bool:
+    """Copy the actual counts onto the counter fields. Returns True if anything changed."""
+    actual = (
+        project.actual_places,
+        project.actual_visited,
+        ProjectService.is_completed(project.actual_places, project.actual_visited),
+    )
+    if (project.places_count, project.visited_count, project.is_completed) == actual:
+        return False
+    project.places_count, project.visited_count, project.is_completed = actual
+    return True
+
+
+class Command(BaseCommand):
+    help = "Recompute Project.places_count / visited_count / is_completed from ProjectArtwork rows and fix drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Projects checked per query")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        checked = repaired = 0
+        last_pk = 0
+
+        while True:
+            chunk = list(with_actual_counts(Project.objects.filter(pk__gt=last_pk).order_by("pk"))[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            checked += len(chunk)
+
+            drifted = [project.pk for project in chunk if fix_counters(project)]
+            if not drifted:
+                continue
+
+            if dry_run:
+                repaired += len(drifted)
+                continue
+
+            # Lock, then recount, so a concurrent place change isn't overwritten
+            with transaction.atomic():
+                list(Project.objects.select_for_update().filter(pk__in=drifted).values_list("pk", flat=True))
+                fixed = [p for p in with_actual_counts(Project.objects.filter(pk__in=drifted)) if fix_counters(p)]
+                now = timezone.now()
+                for project in fixed:
+                    # Repaired projects read differently, so move their ETags and cache keys on,
+                    # and report them to /api/sync/
+                    project.version = F("version") + 1
+                    project.updated_at = now
+                Project.objects.bulk_update(fixed, [*COUNTER_FIELDS, "version", "updated_at"])
+            repaired += len(fixed)
+
+        verb = "would repair" if dry_run else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} projects, {verb} {repaired}."))
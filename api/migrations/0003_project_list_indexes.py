@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_artworkfetchlock'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_at', 'id'], name='api_project_created_bf6fdd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_completed', 'created_at', 'id'], name='api_project_is_comp_d376b2_idx'),
+        ),
+    ]
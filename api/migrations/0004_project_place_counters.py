@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_place_counters(apps, schema_editor):
+    Project = apps.get_model("api", "Project")
+    ProjectArtwork = apps.get_model("api", "ProjectArtwork")
+
+    def count(**filters):
+        links = (
+            ProjectArtwork.objects
+            .filter(project=OuterRef("pk"), **filters)
+            .order_by()
+            .values("project")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(links), 0)
+
+    Project.objects.update(places_count=count(), visited_count=count(visited=True))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_project_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='places_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='visited_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_place_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_project_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ArtworkHydrationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('owner', models.CharField(blank=True, default='', max_length=32)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('artwork', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='hydration_job', to='api.artwork')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='api_artwork_status_f9e3aa_idx')],
+            },
+        ),
+    ]
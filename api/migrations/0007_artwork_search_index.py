@@ -0,0 +1,79 @@
+"""
+Full-text index over Artwork.title and Artwork.license_text, per database backend.
+
+SQLite: an external-content FTS5 table kept in sync by triggers (triggers, unlike
+signals, also see bulk_create/update). Note that SQLite table rebuilds drop
+triggers, so a later migration that remakes api_artwork must recreate them.
+
+PostgreSQL: a GIN index over the weighted tsvector expression used by api/search.py.
+"""
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_artwork_fts USING fts5(
+        title, license_text,
+        content='api_artwork', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER api_artwork_fts_ai AFTER INSERT ON api_artwork BEGIN
+        INSERT INTO api_artwork_fts(rowid, title, license_text) VALUES (new.id, new.title, new.license_text);
+    END
+    """,
+    """
+    CREATE TRIGGER api_artwork_fts_ad AFTER DELETE ON api_artwork BEGIN
+        INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+        VALUES ('delete', old.id, old.title, old.license_text);
+    END
+    """,
+    """
+    CREATE TRIGGER api_artwork_fts_au AFTER UPDATE OF title, license_text ON api_artwork BEGIN
+        INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+        VALUES ('delete', old.id, old.title, old.license_text);
+        INSERT INTO api_artwork_fts(rowid, title, license_text) VALUES (new.id, new.title, new.license_text);
+    END
+    """,
+    "INSERT INTO api_artwork_fts(api_artwork_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS api_artwork_fts_au",
+    "DROP TRIGGER IF EXISTS api_artwork_fts_ad",
+    "DROP TRIGGER IF EXISTS api_artwork_fts_ai",
+    "DROP TABLE IF EXISTS api_artwork_fts",
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX api_artwork_search_idx ON api_artwork USING GIN (
+        (setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', license_text), 'D'))
+    )
+    """,
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS api_artwork_search_idx",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_artwork_hydration'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            run({"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_artwork_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectartwork',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
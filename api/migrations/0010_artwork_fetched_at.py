@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+def populate_fetched_at(apps, schema_editor):
+    # Ready rows were fetched when they were created and never since
+    Artwork = apps.get_model("api", "Artwork")
+    Artwork.objects.filter(status="ready").update(fetched_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_fetched_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,171 @@
+"""
+Move license texts out of Artwork into License, one row per distinct text, keyed by its sha256.
+
+The full-text index of migration 0007 covered the dropped license_text column, so it is
+rebuilt over Artwork.title and the text of Artwork.license:
+
+SQLite: a contentless FTS5 table (search only needs rowids and ranks), fed by triggers
+that look the license text up. License rows never change, so no triggers are needed on
+api_license. As before, a later migration that remakes api_artwork must recreate the
+triggers.
+
+PostgreSQL: one GIN index over the weighted title vector and one over license texts;
+api/search.py matches against either.
+"""
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+OLD_SEARCH = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE api_artwork_fts USING fts5(
+            title, license_text,
+            content='api_artwork', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER api_artwork_fts_ai AFTER INSERT ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(rowid, title, license_text) VALUES (new.id, new.title, new.license_text);
+        END
+        """,
+        """
+        CREATE TRIGGER api_artwork_fts_ad AFTER DELETE ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+            VALUES ('delete', old.id, old.title, old.license_text);
+        END
+        """,
+        """
+        CREATE TRIGGER api_artwork_fts_au AFTER UPDATE OF title, license_text ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+            VALUES ('delete', old.id, old.title, old.license_text);
+            INSERT INTO api_artwork_fts(rowid, title, license_text) VALUES (new.id, new.title, new.license_text);
+        END
+        """,
+        "INSERT INTO api_artwork_fts(api_artwork_fts) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        """
+        CREATE INDEX api_artwork_search_idx ON api_artwork USING GIN (
+            (setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', license_text), 'D'))
+        )
+        """,
+    ],
+}
+
+LICENSE_TEXT = "coalesce((SELECT text FROM api_license WHERE id = {}.license_id), '')"
+
+NEW_SEARCH = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE api_artwork_fts USING fts5(
+            title, license_text,
+            content='',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER api_artwork_fts_ai AFTER INSERT ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(rowid, title, license_text)
+            VALUES (new.id, new.title, {LICENSE_TEXT.format("new")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER api_artwork_fts_ad AFTER DELETE ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+            VALUES ('delete', old.id, old.title, {LICENSE_TEXT.format("old")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER api_artwork_fts_au AFTER UPDATE OF title, license_id ON api_artwork BEGIN
+            INSERT INTO api_artwork_fts(api_artwork_fts, rowid, title, license_text)
+            VALUES ('delete', old.id, old.title, {LICENSE_TEXT.format("old")});
+            INSERT INTO api_artwork_fts(rowid, title, license_text)
+            VALUES (new.id, new.title, {LICENSE_TEXT.format("new")});
+        END
+        """,
+        # Contentless tables can't 'rebuild'
+        """
+        INSERT INTO api_artwork_fts(rowid, title, license_text)
+        SELECT a.id, a.title, coalesce(l.text, '') FROM api_artwork a LEFT JOIN api_license l ON l.id = a.license_id
+        """,
+    ],
+    "postgresql": [
+        "CREATE INDEX api_artwork_search_idx ON api_artwork USING GIN ((setweight(to_tsvector('simple', title), 'A')))",
+        "CREATE INDEX api_license_search_idx ON api_license USING GIN ((to_tsvector('simple', text)))",
+    ],
+}
+
+
+def drop_search(apps, schema_editor):
+    statements = {
+        "sqlite": [
+            "DROP TRIGGER IF EXISTS api_artwork_fts_au",
+            "DROP TRIGGER IF EXISTS api_artwork_fts_ad",
+            "DROP TRIGGER IF EXISTS api_artwork_fts_ai",
+            "DROP TABLE IF EXISTS api_artwork_fts",
+        ],
+        "postgresql": [
+            "DROP INDEX IF EXISTS api_license_search_idx",
+            "DROP INDEX IF EXISTS api_artwork_search_idx",
+        ],
+    }
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def create_search(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+def deduplicate_licenses(apps, schema_editor):
+    Artwork = apps.get_model("api", "Artwork")
+    License = apps.get_model("api", "License")
+    # Distinct texts are few, so one UPDATE per text is cheap
+    texts = list(Artwork.objects.exclude(license_text="").values_list("license_text", flat=True).distinct())
+    for text in texts:
+        license_id = hashlib.sha256(text.encode()).hexdigest()
+        License.objects.get_or_create(id=license_id, defaults={"text": text})
+        Artwork.objects.filter(license_text=text).update(license_id=license_id)
+
+
+def restore_license_text(apps, schema_editor):
+    Artwork = apps.get_model("api", "Artwork")
+    License = apps.get_model("api", "License")
+    for license_id, text in License.objects.values_list("id", "text"):
+        Artwork.objects.filter(license_id=license_id).update(license_text=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='License',
+            fields=[
+                ('id', models.CharField(editable=False, max_length=64, primary_key=True, serialize=False)),
+                ('text', models.TextField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='license',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.license'),
+        ),
+        migrations.RunPython(deduplicate_licenses, restore_license_text),
+        # The old index and triggers reference license_text, which SQLite won't drop while they exist
+        migrations.RunPython(drop_search, create_search(OLD_SEARCH)),
+        migrations.RemoveField(
+            model_name='artwork',
+            name='license_text',
+        ),
+        migrations.RunPython(create_search(NEW_SEARCH), drop_search),
+    ]
@@ -1,17 +1,71 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class License(models.Model):
+    """
+    A license text, stored once however many artworks carry it: the upstream attaches
+    the same paragraph to nearly every artwork. The id is the sha256 of the text, so rows
+    never change and ids can be computed without a query; see api.licenses.
+    """
+    id = models.CharField(primary_key=True, max_length=64, editable=False)
+    text = models.TextField()
+
+    def __str__(self) -> str:
+        return self.id[:12]
 
 
 class Artwork(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"  # placeholder, metadata not fetched yet
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"  # upstream doesn't know the id, or retries ran out
+
     external_id = models.PositiveIntegerField(unique=True, db_index=True)
     title = models.CharField(max_length=500)
-    license_text = models.TextField(blank=True, default="")
+    license = models.ForeignKey(License, on_delete=models.PROTECT, blank=True, null=True, related_name="+")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.READY)
+
+    # When title/license were last read from the upstream; null for placeholders.
+    # Rows older than ARTWORK_REFRESH_TTL are refreshed in the background when read.
+    fetched_at = models.DateTimeField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @property
+    def license_text(self) -> str:
+        """The license's text ("" if none), read through the in-process cache in api.licenses."""
+        from .licenses import license_text
+
+        return license_text(self.license_id)
+
     def __str__(self) -> str:
         return f"{self.external_id}: {self.title}"
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_places_version(self):
+        """Annotate places_version: the sum of the places' versions, which moves whenever any place changes."""
+        places = (
+            ProjectArtwork.objects
+            .filter(project=models.OuterRef("pk"))
+            .values("project")
+            .annotate(total=models.Sum("version"))
+            .values("total")
+        )
+        return self.annotate(places_version=Coalesce(models.Subquery(places), 0))
+
+    def with_places(self):
+        """Prefetch places with their artworks, so serializing projects costs a fixed number of queries."""
+        return self.prefetch_related(
+            models.Prefetch(
+                "project_artworks",
+                queryset=ProjectArtwork.objects.with_artwork().order_by("id"),
+            )
+        )
+
+
 class Project(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
@@ -21,7 +75,26 @@ class Project(models.Model):
 
     is_completed = models.BooleanField(default=False, db_index=True)
 
+    # Denormalized from ProjectArtwork, kept in step by ProjectService.adjust_counters
+    places_count = models.PositiveIntegerField(default=0)
+    visited_count = models.PositiveIntegerField(default=0)
+
+    # Bumped on every change to the project or its places; drives ETags and the response cache
+    version = models.PositiveIntegerField(default=1)
+
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the project list, optionally filtered by completion
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["is_completed", "created_at", "id"]),
+            # Change feed (api.sync)
+            models.Index(fields=["updated_at", "id"]),
+        ]
 
     def mark_completed(self):
         """Convenience helper"""
@@ -37,6 +110,11 @@ class Project(models.Model):
         return self.name
 
 
+class ProjectArtworkQuerySet(models.QuerySet):
+    def with_artwork(self):
+        return self.select_related("artwork")
+
+
 class ProjectArtwork(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="project_artworks",)
     artwork = models.ForeignKey(Artwork, on_delete=models.CASCADE)
@@ -44,14 +122,114 @@ class ProjectArtwork(models.Model):
     notes = models.TextField(blank=True, default="")
     visited = models.BooleanField(default=False)
 
+    # Bumped on every change to the place (or its artwork's metadata); used for conditional
+    # updates and the place's ETag. The project's ETag includes the sum over its places.
+    version = models.PositiveIntegerField(default=1)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectArtworkQuerySet.as_manager()
+
     class Meta:
         unique_together = ("project", "artwork")
         indexes = [
             models.Index(fields=["project", "visited"]),
+            # Change feed (api.sync)
+            models.Index(fields=["updated_at", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} -> {self.artwork_id}"
+
+class ArtworkFetchLock(models.Model):
+    """
+    Marks an external_id as being fetched from the upstream API by some worker process,
+    so other processes wait for that fetch instead of repeating it.
+    """
+    external_id = models.PositiveIntegerField(unique=True)
+    owner = models.CharField(max_length=32)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.external_id} ({self.owner})"
+
+
+class ArtworkHydrationJob(models.Model):
+    """
+    Queued upstream fetch for a placeholder Artwork, or a refresh of a ready one gone stale.
+    Drained by `manage.py hydrate_artworks`; finished jobs are deleted.
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        FAILED = "failed", "Failed"
+
+    artwork = models.OneToOneField(Artwork, on_delete=models.CASCADE, related_name="hydration_job")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # Set while a worker holds the job; an expired lease makes it claimable again
+    owner = models.CharField(max_length=32, blank=True, default="")
+    locked_until = models.DateTimeField(blank=True, null=True)
+
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.artwork_id} ({self.status}, attempt {self.attempts})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client's Idempotency-Key for one endpoint, and the response to the first request
+    that used it, replayed to retries until expires_at. See api.idempotency.
+    """
+    key = models.CharField(max_length=255)
+    path = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)  # sha256 of the request, to catch reused keys
+
+    # Held by the request running under the key; a lapsed lock can be taken over
+    owner = models.CharField(max_length=32)
+    locked_until = models.DateTimeField()
+
+    # Null until the first request has finished
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    body = models.BinaryField(blank=True, default=b"")
+
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("key", "path")
+
+    def __str__(self):
+        return f"{self.key} {self.path} ({self.status_code or 'in progress'})"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted object, so the change feed (api.sync) can report the deletion.
+
+    A project's places are deleted with it and covered by its tombstone.
+    """
+    class Kind(models.TextChoices):
+        PROJECT = "project", "Project"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"]),
         ]
 
     def __str__(self):
-        return f"{self.project_id} -> {self.artwork_id}"
\ No newline at end of file
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
@@ -0,0 +1,174 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (created_at, id), newest first.
+
+    Each page seeks from the last row of the previous one instead of using OFFSET,
+    so page N costs the same as page 1. The cursor is opaque to clients.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 20
+    max_page_size = 100
+
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        rows = list(queryset.order_by("-created_at", "-id")[:page_size + 1])
+        page = rows[:page_size]
+
+        self.next_position = None
+        if len(rows) > page_size:
+            last = page[-1]
+            self.next_position = (last.created_at, last.id)
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    @staticmethod
+    def encode_cursor(position):
+        created_at, pk = position
+        raw = json.dumps([created_at.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            created_at, pk = json.loads(raw)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SearchCursorPagination(KeysetPagination):
+    """
+    Cursor pagination over (rank, id) for ranked search results, best match first.
+
+    Ranks depend on index statistics, so rows written between two page requests
+    may shift slightly; that is acceptable for search, which is never exhaustive.
+    """
+    page_size = 10
+    max_page_size = 50
+
+    def paginate_search(self, search, request, view=None):
+        """search is a callable (after, limit) -> rows, each with `rank` and `id`."""
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        rows = search(after=self.decode_cursor(request), limit=page_size + 1)
+        page = rows[:page_size]
+
+        self.next_position = None
+        if len(rows) > page_size:
+            last = page[-1]
+            self.next_position = (last.rank, last.id)
+
+        return page
+
+    @staticmethod
+    def encode_cursor(position):
+        raw = json.dumps(list(position)).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            rank, pk = json.loads(raw)
+            return float(rank), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SyncCursorPagination(KeysetPagination):
+    """
+    Cursor over the change feed's (timestamp, stream, id) positions, oldest change first.
+
+    Unlike the list cursors, it is handed out on every page, including the last: clients
+    keep it and pass it as `since` next time to get only what changed in between.
+    """
+    cursor_query_param = "since"
+    page_size = 100
+    max_page_size = 500
+
+    def paginate_changes(self, feed, request, view=None):
+        """feed is a callable (after, limit) -> (changes, position, has_more), like ChangeFeed.changes."""
+        self.request = request
+        after = self.decode_cursor(request)
+
+        changes, position, self.has_more = feed(after=after, limit=self.get_page_size(request))
+        # Nothing new: the client keeps its place
+        self.next_position = position or after
+        return changes
+
+    def get_paginated_response(self, data):
+        cursor = None if self.next_position is None else self.encode_cursor(self.next_position)
+        return Response({**data, "cursor": cursor, "has_more": self.has_more})
+
+    @staticmethod
+    def encode_cursor(position):
+        timestamp, stream, pk = position
+        raw = json.dumps([timestamp.isoformat(), stream, pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            timestamp, stream, pk = json.loads(raw)
+            return datetime.fromisoformat(timestamp), int(stream), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.utils.http import parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing.
+
+    closed:    calls go through; outcomes within the last `window` seconds are tracked,
+               and once at least `min_calls` of them fail at `failure_rate` or more, it opens.
+    open:      calls are refused outright for `open_seconds`.
+    half_open: up to `half_open_calls` probe calls go through. A success closes the
+               circuit again, a failure re-opens it.
+
+    State is per process; each worker learns about an outage on its own.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window=30, open_seconds=30, half_open_calls=1, name="upstream"):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._outcomes = deque()  # (monotonic time, ok)
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now. In half-open state this takes a probe slot."""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def release(self):
+        """Give back a slot taken by allow() for a call that was not made after all."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def retry_after(self) -> float:
+        """Seconds until calls may be attempted again (0 unless open)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def record(self, ok: bool):
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+
+            if self._state == self.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if ok:
+                    self._transition(self.CLOSED, now)
+                else:
+                    self._transition(self.OPEN, now)
+                return
+            if self._state == self.OPEN:
+                # Late result of a call made before the circuit opened
+                return
+
+            self._outcomes.append((now, ok))
+            self._prune(now)
+            failures = sum(1 for _, success in self._outcomes if not success)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+                self._transition(self.OPEN, now)
+
+    def _advance(self, now):
+        if self._state == self.OPEN and now >= self._opened_at + self.open_seconds:
+            self._transition(self.HALF_OPEN, now)
+        elif self._state == self.HALF_OPEN and now >= self._opened_at + 2 * self.open_seconds:
+            # Probes that never reported back must not keep the circuit half-open forever
+            self._opened_at = now - self.open_seconds
+            self._probes = 0
+
+    def _prune(self, now):
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._outcomes.popleft()
+
+    def _transition(self, state, now):
+        logger.warning("Circuit for %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        self._outcomes.clear()
+        self._probes = 0
+        if state == self.OPEN:
+            self._opened_at = now
+
+
+class TokenBucket:
+    """
+    Rate limiter: `rate` calls per second with bursts of up to `burst`.
+
+    Adaptive: throttle() halves the rate and pauses all calls for a while (use it on
+    a 429, with the upstream's Retry-After); every successful call then wins back a
+    little of the rate, up to the configured maximum.
+    """
+
+    def __init__(self, rate=10.0, burst=20, min_rate=0.5):
+        self.max_rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._rate = self.max_rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def rate(self):
+        return self._rate
+
+    def reserve(self, max_wait: float):
+        """
+        Reserve one call.
+
+        Returns:
+            float | None: Seconds to sleep before making the call, or None when that
+            would exceed max_wait (nothing is reserved then).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            wait = max(0.0, self._paused_until - now, (1 - self._tokens) / self._rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def retry_after(self) -> float:
+        """Seconds until a call could go ahead without waiting."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return max(0.0, self._paused_until - now, (1 - self._tokens) / self._rate)
+
+    def throttle(self, retry_after: float = 0.0):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def recover(self):
+        with self._lock:
+            if self._rate < self.max_rate:
+                self._rate = min(self.max_rate, self._rate + self.max_rate / 20)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+def parse_retry_after(value, default=1.0) -> float:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    when = parse_http_date_safe(value)
+    return default if when is None else max(0.0, when - time.time())
@@ -0,0 +1,93 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Artwork
+
+# Match the indexes built by migration 0012 on PostgreSQL; must stay identical for the indexes to be used
+PG_TITLE_VECTOR = "setweight(to_tsvector('simple', a.title), 'A')"
+PG_LICENSE_VECTOR = "to_tsvector('simple', l.text)"
+
+
+class ArtworkSearch:
+    """
+    Ranked full-text search over the local Artwork table (title and license text).
+
+    Backed by the FTS5 table on SQLite and by the tsvector GIN indexes on PostgreSQL.
+    Every term must match; the last one matches as a prefix, so partial words typed
+    into an autocomplete box already find results. Titles weigh more than license text.
+    On PostgreSQL the terms must all match within the title or all within the license
+    text, as each has its own index.
+
+    Rows come back best first, ordered by (rank, id) with rank ascending on both
+    backends, which is what the search cursor seeks on.
+
+    Other backends have no index for it and fall back to unranked icontains matching.
+    """
+    MAX_TERMS = 8
+
+    @classmethod
+    def terms(cls, query):
+        return re.findall(r"\w+", query.lower())[:cls.MAX_TERMS]
+
+    @classmethod
+    def search(cls, query, *, after=None, limit=20):
+        """
+        Args:
+            query: Raw user input
+            after: (rank, id) of the last row of the previous page, or None
+            limit: Maximum rows to return
+
+        Returns:
+            list: Artwork instances, each with a `rank` attribute
+        """
+        terms = cls.terms(query)
+        if not terms:
+            return []
+
+        if connection.vendor == "postgresql":
+            match = " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+            ranked = (
+                f"SELECT a.id, -ts_rank({PG_TITLE_VECTOR} || setweight(coalesce({PG_LICENSE_VECTOR}, ''), 'D'), q) AS rank "
+                f"FROM api_artwork a LEFT JOIN api_license l ON l.id = a.license_id "
+                f"CROSS JOIN to_tsquery('simple', %s) q "
+                f"WHERE {PG_TITLE_VECTOR} @@ q "
+                f"OR a.license_id IN (SELECT l.id FROM api_license l WHERE {PG_LICENSE_VECTOR} @@ q)"
+            )
+        elif connection.vendor == "sqlite":
+            match = " ".join([*(f'"{t}"' for t in terms[:-1]), f'"{terms[-1]}"*'])
+            ranked = (
+                "SELECT rowid AS id, bm25(api_artwork_fts, 10.0, 1.0) AS rank "
+                "FROM api_artwork_fts WHERE api_artwork_fts MATCH %s"
+            )
+        else:
+            return cls._search_unindexed(terms, after=after, limit=limit)
+
+        params = [match, Artwork.Status.READY]
+        seek = ""
+        if after is not None:
+            rank, pk = after
+            seek = "AND (s.rank > %s OR (s.rank = %s AND s.id > %s))"
+            params += [rank, rank, pk]
+
+        sql = (
+            f"SELECT a.*, s.rank FROM ({ranked}) s JOIN api_artwork a ON a.id = s.id "
+            f"WHERE a.status = %s {seek} "
+            f"ORDER BY s.rank, s.id LIMIT %s"
+        )
+        return list(Artwork.objects.raw(sql, [*params, limit]))
+
+    @classmethod
+    def _search_unindexed(cls, terms, *, after, limit):
+        """Every term in the title or the license text, by id; all ranks are 0."""
+        qs = Artwork.objects.filter(status=Artwork.Status.READY)
+        for term in terms:
+            qs = qs.filter(Q(title__icontains=term) | Q(license__text__icontains=term))
+        if after is not None:
+            qs = qs.filter(pk__gt=after[1])
+
+        rows = list(qs.order_by("pk")[:limit])
+        for row in rows:
+            row.rank = 0.0
+        return rows
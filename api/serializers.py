@@ -1,11 +1,40 @@
 from rest_framework import serializers
-from .models import Artwork, Project, ProjectArtwork
+from .models import Artwork, License, Project, ProjectArtwork, Tombstone
 
 
 class ArtworkSerializer(serializers.ModelSerializer):
+    """With context["compact"], the license is given as license_id instead of its text."""
+
     class Meta:
         model = Artwork
-        fields = ["id", "external_id", "title", "license_text"]
+        fields = ["id", "external_id", "title", "license_text", "status"]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("compact"):
+            return fields
+        # license_id takes license_text's place, so the field order stays the same
+        compact = {}
+        for name, field in fields.items():
+            if name == "license_text":
+                name, field = "license_id", serializers.CharField(allow_null=True, read_only=True)
+            compact[name] = field
+        return compact
+
+
+class LicenseSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = License
+        fields = ["id", "text"]
+
+
+class CompactModeSerializer(serializers.Serializer):
+    """Query parameter shared by the reads that return artworks"""
+    compact = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Give each artwork's license as `license_id` (see /api/licenses/<id>/) instead of its full text",
+    )
 
 
 class ProjectCreateSerializer(serializers.Serializer):
@@ -35,6 +64,44 @@ class ProjectCreateSerializer(serializers.Serializer):
         return deduped
 
 
+def validate_each(serializer_class, records):
+    """
+    Validate records one by one, so one invalid record doesn't reject the others.
+
+    Returns:
+        tuple: (valid, errors) - [(index, validated_data)] and [{"index", "errors"}]
+    """
+    valid, errors = [], []
+    for index, record in enumerate(records):
+        serializer = serializer_class(data=record)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+    return valid, errors
+
+
+class ProjectListFilterSerializer(CompactModeSerializer):
+    """Query parameters for the project list"""
+    is_completed = serializers.BooleanField(required=False, allow_null=True, default=None)
+    start_date_after = serializers.DateField(required=False)
+    start_date_before = serializers.DateField(required=False)
+    cursor = serializers.CharField(required=False, help_text="Opaque cursor from the previous page's `next` link")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100)
+
+
+class ProjectExportSerializer(serializers.Serializer):
+    """Query parameters for the project export"""
+    output = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+
+
+class ArtworkSearchSerializer(CompactModeSerializer):
+    """Query parameters for artwork search"""
+    q = serializers.CharField(max_length=200, help_text="Search terms; the last one may be a partial word")
+    cursor = serializers.CharField(required=False, help_text="Opaque cursor from the previous page's `next` link")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50)
+
+
 class ProjectUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
@@ -72,10 +139,60 @@ class ProjectSerializer(serializers.ModelSerializer):
         ]
 
 
+class SyncProjectSerializer(serializers.ModelSerializer):
+    """A project in the change feed; its places are separate entries"""
+
+    class Meta:
+        model = Project
+        fields = [f for f in ProjectSerializer.Meta.fields if f != "artworks"]
+
+
+class SyncPlaceSerializer(ProjectArtworkSerializer):
+    """A place in the change feed, with the project it belongs to"""
+
+    class Meta(ProjectArtworkSerializer.Meta):
+        fields = ["project", *ProjectArtworkSerializer.Meta.fields]
+
+
+class SyncTombstoneSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="kind")
+    id = serializers.IntegerField(source="object_id")
+
+    class Meta:
+        model = Tombstone
+        fields = ["type", "id", "deleted_at"]
+
+
+class SyncFeedSerializer(CompactModeSerializer):
+    """Query parameters for the change feed"""
+    since = serializers.CharField(required=False, help_text="`cursor` from the previous response; omit for a full sync")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=500)
+
+
 class ProjectAddArtworkSerializer(serializers.Serializer):
     artwork_id = serializers.IntegerField(min_value=1)
 
 
 class ProjectArtworkUpdateSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
-    visited = serializers.BooleanField(required=False)
\ No newline at end of file
+    visited = serializers.BooleanField(required=False)
+
+
+class ProjectArtworkBulkUpdateSerializer(ProjectArtworkUpdateSerializer):
+    """One entry of a bulk place update; artwork_id = Artwork.external_id"""
+    artwork_id = serializers.IntegerField(min_value=1)
+
+
+class ProjectArtworkBulkUpdateListSerializer(serializers.ListSerializer):
+    child = ProjectArtworkBulkUpdateSerializer()
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("allow_empty", False)
+        kwargs.setdefault("max_length", 10)
+        super().__init__(*args, **kwargs)
+
+    def validate(self, attrs):
+        ids = [item["artwork_id"] for item in attrs]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each artwork_id may appear only once.")
+        return attrs
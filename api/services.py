@@ -1,78 +1,732 @@
-import requests
-from .models import Artwork, Project, ProjectArtwork
+import asyncio
+import contextvars
+import functools
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
 
-ARTIC_BASE = "https://api.artic.edu/api/v1/artworks"
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.lookups import Exact, GreaterThan
+from django.utils import timezone
+
+from .cache import get_artwork_cache
+from .clients import get_artic_client
+from .licenses import asave_licenses, license_for, save_licenses
+from .models import Artwork, ArtworkFetchLock, ArtworkHydrationJob, Project, ProjectArtwork, Tombstone
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+# Upstream fetches currently in flight in this process, by external_id
+_inflight_fetches = SingleFlight()
+_ainflight_fetches = AsyncSingleFlight()
 
 
 class ArtworkService:
+    # Upper bound on parallel upstream batch requests per call
+    MAX_WORKERS = 4
+    # Overall budget for one fetch_missing_artworks call, in seconds.
+    # Batches run in parallel, so this is roughly the cost of the slowest one.
+    FETCH_DEADLINE = 10
+    # Budget for bulk lookups (imports), which may fetch thousands of ids; their batches
+    # queue for the rate limiter within it instead of failing fast
+    BULK_FETCH_DEADLINE = 10 * 60
+    # How often to check for artworks another process is fetching, in seconds
+    LOCK_POLL_INTERVAL = 0.1
+
+    @staticmethod
+    def get_artworks(external_ids, bulk=False):
+        """
+        Resolve artworks by external ID: cache first, then the DB, then the upstream API.
+
+        Newly fetched artworks are saved. Found rows and upstream 404s are cached,
+        so repeat lookups of either cost neither a DB query nor an HTTP call.
+
+        Args:
+            external_ids: List of artwork external IDs
+            bulk: Fetch with BULK_FETCH_DEADLINE, waiting for the rate limiter, as for an import
+
+        Returns:
+            tuple: (artworks_by_external_id, fetch_errors)
+        """
+        cache = get_artwork_cache()
+
+        artworks, not_found = cache.get_many(external_ids)
+        fetch_errors = [{"id": aid, **cache.NOT_FOUND} for aid in not_found]
+
+        unknown = [aid for aid in external_ids if aid not in artworks and aid not in not_found]
+        known = set()
+        if unknown:
+            existing = list(Artwork.objects.filter(external_id__in=unknown))
+            # Placeholders change once hydrated, so only finished rows are cached
+            cache.set_artworks([a for a in existing if a.status == Artwork.Status.READY])
+            fetch_errors.extend(ArtworkService._add_usable(artworks, existing))
+            known = {a.external_id for a in existing}
+
+        # Stale rows are still served as they are; a worker refreshes them
+        ArtworkHydrationService.refresh_stale(artworks.values())
+
+        missing_ids = [aid for aid in unknown if aid not in known]
+        if missing_ids and settings.ARTWORK_HYDRATION_MODE == "async":
+            # Don't wait for the upstream: hand out placeholders and let the worker fill them in
+            artworks.update(ArtworkHydrationService.enqueue(missing_ids))
+        elif missing_ids:
+            # Concurrent requests for the same ids share one upstream fetch
+            results = _inflight_fetches.do_many(
+                missing_ids,
+                functools.partial(ArtworkService._fetch_and_store, bulk=bulk),
+                timeout=ArtworkService.BULK_FETCH_DEADLINE if bulk else ArtworkService.FETCH_DEADLINE,
+                on_timeout=lambda aid: (None, {"id": aid, "error": "Timed out waiting for Art Institute API."}),
+            )
+            for aid in missing_ids:
+                artwork, error = results[aid] or (None, {"id": aid, "error": "Artwork could not be fetched."})
+                if artwork is not None:
+                    artworks[aid] = artwork
+                else:
+                    fetch_errors.append(error)
+
+        return artworks, fetch_errors
+
     @staticmethod
-    def fetch_missing_artworks(missing_ids):
+    async def aget_artworks(external_ids):
+        """
+        Async get_artworks: async ORM and HTTP, so waiting on the upstream doesn't hold a thread.
+
+        Concurrent requests on the same event loop share upstream fetches; the cross-process
+        fetch locks of the sync path are not used here.
+
+        Returns:
+            tuple: (artworks_by_external_id, fetch_errors)
+        """
+        cache = get_artwork_cache()
+
+        artworks, not_found = cache.get_many(external_ids)
+        fetch_errors = [{"id": aid, **cache.NOT_FOUND} for aid in not_found]
+
+        unknown = [aid for aid in external_ids if aid not in artworks and aid not in not_found]
+        known = set()
+        if unknown:
+            existing = [a async for a in Artwork.objects.filter(external_id__in=unknown)]
+            cache.set_artworks([a for a in existing if a.status == Artwork.Status.READY])
+            fetch_errors.extend(ArtworkService._add_usable(artworks, existing))
+            known = {a.external_id for a in existing}
+
+        if ArtworkHydrationService.stale(artworks.values()):
+            await sync_to_async(ArtworkHydrationService.refresh_stale)(artworks.values())
+
+        missing_ids = [aid for aid in unknown if aid not in known]
+        if missing_ids and settings.ARTWORK_HYDRATION_MODE == "async":
+            artworks.update(await sync_to_async(ArtworkHydrationService.enqueue)(missing_ids))
+        elif missing_ids:
+            results = await _ainflight_fetches.do_many(
+                missing_ids,
+                ArtworkService._afetch_and_save,
+                timeout=ArtworkService.FETCH_DEADLINE,
+                on_timeout=lambda aid: (None, {"id": aid, "error": "Timed out waiting for Art Institute API."}),
+            )
+            for aid in missing_ids:
+                artwork, error = results[aid] or (None, {"id": aid, "error": "Artwork could not be fetched."})
+                if artwork is not None:
+                    artworks[aid] = artwork
+                else:
+                    fetch_errors.append(error)
+
+        return artworks, fetch_errors
+
+    @staticmethod
+    def _add_usable(artworks, existing):
+        """
+        Add existing rows to artworks, except failed ones: the upstream doesn't know
+        those ids, or gave up on them, so they can't become places.
+
+        Returns:
+            list: fetch errors for the failed rows
+        """
+        errors = []
+        for artwork in existing:
+            if artwork.status == Artwork.Status.FAILED:
+                errors.append({"id": artwork.external_id, "error": "Artwork could not be fetched from Art Institute API."})
+            else:
+                artworks[artwork.external_id] = artwork
+        return errors
+
+    @staticmethod
+    async def _afetch_and_save(external_ids):
+        """
+        Async _fetch_and_save.
+
+        Returns:
+            dict: external ID -> (artwork, error), exactly one of them None
+        """
+        cache = get_artwork_cache()
+        created_artworks, fetch_errors = await ArtworkService.afetch_missing_artworks(list(external_ids))
+        cache.set_not_found([e["id"] for e in fetch_errors if e.get("status_code") == 404])
+
+        results = {e["id"]: (None, e) for e in fetch_errors}
+        if created_artworks:
+            await asave_licenses(a.license for a in created_artworks)
+            await Artwork.objects.abulk_create(created_artworks, ignore_conflicts=True)
+            created = [
+                a async for a in Artwork.objects.filter(external_id__in=[a.external_id for a in created_artworks])
+            ]
+            cache.set_artworks(created)
+            results.update((a.external_id, (a, None)) for a in created)
+
+        return results
+
+    @staticmethod
+    def _fetch_and_store(external_ids, bulk=False):
+        """
+        Fetch ids from the upstream, save and cache the results.
+
+        Ids are claimed in ArtworkFetchLock first, so across worker processes each id
+        is fetched once: ids claimed by another process are waited for in the DB
+        instead, and only fetched here if that process doesn't deliver in time.
+        Locks are only visible to other processes when not called inside a transaction.
+
+        Fetching, waiting and fetching the leftovers share one FETCH_DEADLINE, or with
+        bulk=True one BULK_FETCH_DEADLINE, within which batches wait for the rate limiter.
+
+        Returns:
+            dict: external ID -> (artwork, error), exactly one of them None
+        """
+        cache = get_artwork_cache()
+        budget = ArtworkService.BULK_FETCH_DEADLINE if bulk else ArtworkService.FETCH_DEADLINE
+        deadline = time.monotonic() + budget
+        owner = uuid.uuid4().hex
+        claimed = ArtworkService._claim_fetch_locks(external_ids, owner, budget)
+        try:
+            results = {}
+            if claimed:
+                results = ArtworkService._fetch_and_save(claimed, timeout=deadline - time.monotonic(), queue=bulk)
+
+            others = [aid for aid in external_ids if aid not in claimed]
+            if others:
+                found = ArtworkService._wait_for_artworks(others, deadline)
+                cache.set_artworks(found.values())
+                results.update((aid, (artwork, None)) for aid, artwork in found.items())
+
+                # The other process may have got a 404, which a shared cache backend remembers
+                _, not_found = cache.get_many([aid for aid in others if aid not in found])
+                results.update((aid, (None, {"id": aid, **cache.NOT_FOUND})) for aid in not_found)
+
+                leftover = [aid for aid in others if aid not in results]
+                remaining = deadline - time.monotonic()
+                if leftover and remaining > 0:
+                    results.update(ArtworkService._fetch_and_save(leftover, timeout=remaining, queue=bulk))
+                elif leftover:
+                    results.update(
+                        (aid, (None, {"id": aid, "error": "Timed out waiting for Art Institute API."}))
+                        for aid in leftover
+                    )
+        finally:
+            ArtworkFetchLock.objects.filter(external_id__in=claimed, owner=owner).delete()
+
+        return results
+
+    @staticmethod
+    def _claim_fetch_locks(external_ids, owner, budget):
+        """Claim fetch locks for as many ids as possible, for a fetch of budget seconds; returns the claimed ids."""
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=2 * budget)
+
+        # Locks left behind by a crashed worker must not block the id forever
+        ArtworkFetchLock.objects.filter(external_id__in=external_ids, expires_at__lte=now).delete()
+        ArtworkFetchLock.objects.bulk_create(
+            [ArtworkFetchLock(external_id=aid, owner=owner, expires_at=expires_at) for aid in external_ids],
+            ignore_conflicts=True,
+        )
+        claimed = set(
+            ArtworkFetchLock.objects
+            .filter(external_id__in=external_ids, owner=owner)
+            .values_list("external_id", flat=True)
+        )
+        return [aid for aid in external_ids if aid in claimed]
+
+    @staticmethod
+    def _wait_for_artworks(external_ids, deadline):
+        """
+        Poll the DB for artworks another process is fetching.
+
+        Stops once every id has either appeared or had its lock released, or at the
+        time.monotonic() deadline. Returns the artworks found, by external ID.
+        """
+        found = {}
+        pending = list(external_ids)
+
+        while pending:
+            found.update((a.external_id, a) for a in Artwork.objects.filter(external_id__in=pending))
+            pending = [aid for aid in pending if aid not in found]
+            if not pending or time.monotonic() >= deadline:
+                break
+
+            still_locked = ArtworkFetchLock.objects.filter(external_id__in=pending, expires_at__gt=timezone.now())
+            if not still_locked.exists():
+                break
+            time.sleep(ArtworkService.LOCK_POLL_INTERVAL)
+
+        return found
+
+    @staticmethod
+    def _fetch_and_save(external_ids, timeout=None, queue=False):
+        """
+        Fetch ids from the upstream, save new artworks and cache both rows and 404s.
+        With queue=True, batches may wait the whole timeout for the rate limiter.
+
+        Returns:
+            dict: external ID -> (artwork, error), exactly one of them None
+        """
+        cache = get_artwork_cache()
+        created_artworks, fetch_errors = ArtworkService.fetch_missing_artworks(
+            list(external_ids), timeout=timeout, max_queue_wait=timeout if queue else None,
+        )
+        cache.set_not_found([e["id"] for e in fetch_errors if e.get("status_code") == 404])
+
+        results = {e["id"]: (None, e) for e in fetch_errors}
+        if created_artworks:
+            save_licenses(a.license for a in created_artworks)
+            Artwork.objects.bulk_create(created_artworks, ignore_conflicts=True)
+            # Re-read: ignore_conflicts leaves pks unset, and a concurrent insert may have won
+            created = list(Artwork.objects.filter(external_id__in=[a.external_id for a in created_artworks]))
+            cache.set_artworks(created)
+            results.update((a.external_id, (a, None)) for a in created)
+
+        return results
+
+    @staticmethod
+    def fetch_missing_artworks(missing_ids, timeout=None, max_queue_wait=None):
         """
         Fetch missing artworks from Art Institute API.
-        
+
+        IDs are collapsed into multi-id requests of up to ArticClient.BATCH_SIZE,
+        sent over the process-wide pooled client. Batches run concurrently; anything
+        still in flight when the timeout expires is reported as an error.
+
         Args:
             missing_ids: List of artwork external IDs to fetch
-            
+            timeout: Seconds to wait for the batches, FETCH_DEADLINE by default
+            max_queue_wait: Longest a batch may wait for the rate limiter, the client's default if None
+
+        Returns:
+            tuple: (created_artworks, fetch_errors)
+        """
+        if not missing_ids:
+            return [], []
+
+        client = get_artic_client()
+        size = client.BATCH_SIZE
+        batches = [missing_ids[i:i + size] for i in range(0, len(missing_ids), size)]
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(ArtworkService.MAX_WORKERS, len(batches)),
+            thread_name_prefix="artic-fetch",
+        )
+        # Each batch runs in a copy of this context, so its upstream call counts towards the request
+        futures = [
+            executor.submit(contextvars.copy_context().run, client.fetch_batch, batch, max_queue_wait)
+            for batch in batches
+        ]
+        done, _ = wait(futures, timeout=ArtworkService.FETCH_DEADLINE if timeout is None else timeout)
+        # Don't let stragglers hold up the response; they finish (or time out) on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        outcomes = []
+        for batch, future in zip(batches, futures):
+            if future in done:
+                outcomes.append(future.result())
+            else:
+                outcomes.append(({}, [{"id": aid, "error": "Timed out waiting for Art Institute API."} for aid in batch]))
+
+        return ArtworkService._build_artworks(missing_ids, outcomes)
+
+    @staticmethod
+    def _build_artworks(missing_ids, outcomes):
+        """
+        Turn per-batch (found, fetch_errors) outcomes into unsaved Artworks, in missing_ids order.
+        Their Licenses are unsaved too; save_licenses() them before the artworks.
+
         Returns:
             tuple: (created_artworks, fetch_errors)
         """
         created_artworks = []
         fetch_errors = []
+        now = timezone.now()
+
+        found = {}
+        for batch_found, batch_errors in outcomes:
+            found.update(batch_found)
+            fetch_errors.extend(batch_errors)
 
         for aid in missing_ids:
-            try:
-                r = requests.get(f"{ARTIC_BASE}/{aid}", timeout=10)
-                if r.status_code != 200:
-                    fetch_errors.append({"id": aid, "status_code": r.status_code})
-                    continue
-
-                payload = r.json() or {}
-                api_data = payload.get("data") or {}
-                info = payload.get("info") or {}
-
-                title = api_data.get("title") or ""
-                license_text = info.get("license_text") or ""
-
-                if not title:
-                    # Up to you: allow blank title, or treat as error
-                    title = f"Artwork {aid}"
-
-                created_artworks.append(
-                    Artwork(
-                        external_id=aid,
-                        title=title,
-                        license_text=license_text,
-                    )
+            if aid not in found:
+                continue
+
+            title = found[aid]["title"]
+            if not title:
+                # Up to you: allow blank title, or treat as error
+                title = f"Artwork {aid}"
+
+            created_artworks.append(
+                Artwork(
+                    external_id=aid,
+                    title=title,
+                    license=license_for(found[aid]["license_text"]),
+                    fetched_at=now,
                 )
-            except requests.RequestException as e:
-                fetch_errors.append({"id": aid, "error": str(e)})
+            )
 
         return created_artworks, fetch_errors
 
+    @staticmethod
+    async def afetch_missing_artworks(missing_ids):
+        """
+        Async fetch_missing_artworks: batches run concurrently on the event loop.
+
+        Returns:
+            tuple: (created_artworks, fetch_errors)
+        """
+        if not missing_ids:
+            return [], []
+
+        client = get_artic_client()
+        size = client.BATCH_SIZE
+        batches = [missing_ids[i:i + size] for i in range(0, len(missing_ids), size)]
+
+        tasks = [asyncio.ensure_future(client.afetch_batch(batch)) for batch in batches]
+        done, pending = await asyncio.wait(tasks, timeout=ArtworkService.FETCH_DEADLINE)
+        for task in pending:
+            task.cancel()
+
+        outcomes = []
+        for batch, task in zip(batches, tasks):
+            if task in done:
+                outcomes.append(task.result())
+            else:
+                outcomes.append(({}, [{"id": aid, "error": "Timed out waiting for Art Institute API."} for aid in batch]))
+
+        return ArtworkService._build_artworks(missing_ids, outcomes)
+
+
+class ArtworkHydrationService:
+    """
+    DB-backed queue that fills in placeholder artworks in the background, and refreshes
+    ready ones older than ARTWORK_REFRESH_TTL (a job for a ready artwork is a refresh).
+
+    Jobs are claimed with a lease, so any number of worker threads and processes can
+    drain the queue, and a crashed worker's jobs become claimable again.
+    """
+    BATCH_SIZE = 100
+    MAX_ATTEMPTS = 8
+    # Retry n waits min(BACKOFF_BASE * 2**(n-1), BACKOFF_MAX) seconds, plus up to 10% jitter
+    BACKOFF_BASE = 5
+    BACKOFF_MAX = 60 * 60
+    # How long a claimed job stays reserved for its worker, in seconds
+    LEASE = 60
+
+    @staticmethod
+    def enqueue(external_ids):
+        """
+        Insert pending placeholder artworks and their hydration jobs.
+
+        Returns:
+            dict: external ID -> Artwork (placeholder, or the existing row if there was one)
+        """
+        Artwork.objects.bulk_create(
+            [Artwork(external_id=aid, title=f"Artwork {aid}", status=Artwork.Status.PENDING) for aid in external_ids],
+            ignore_conflicts=True,
+        )
+        artworks = list(Artwork.objects.filter(external_id__in=external_ids))
+        ArtworkHydrationJob.objects.bulk_create(
+            [ArtworkHydrationJob(artwork=a) for a in artworks if a.status == Artwork.Status.PENDING],
+            ignore_conflicts=True,
+        )
+        return {a.external_id: a for a in artworks}
+
+    @staticmethod
+    def refresh_cutoff():
+        """fetched_at before which a ready artwork is stale; None if refreshing is off."""
+        if not settings.ARTWORK_REFRESH_TTL:
+            return None
+        return timezone.now() - timedelta(seconds=settings.ARTWORK_REFRESH_TTL)
+
+    @staticmethod
+    def is_stale(status, fetched_at, cutoff) -> bool:
+        return cutoff is not None and status == Artwork.Status.READY and (fetched_at is None or fetched_at < cutoff)
+
+    @staticmethod
+    def stale(artworks):
+        """The ready artworks among these that were fetched more than ARTWORK_REFRESH_TTL ago."""
+        cutoff = ArtworkHydrationService.refresh_cutoff()
+        return [a for a in artworks if ArtworkHydrationService.is_stale(a.status, a.fetched_at, cutoff)]
+
+    @staticmethod
+    def refresh_stale(artworks):
+        """Queue refreshes for the stale ones among these artworks; no query unless there are some."""
+        stale = ArtworkHydrationService.stale(artworks)
+        if stale:
+            ArtworkHydrationService.enqueue_refresh([a.pk for a in stale])
+
+    @staticmethod
+    def enqueue_refresh(artwork_ids):
+        """
+        Queue refresh jobs for artworks (by pk) that are stale in the DB; artworks that
+        already have a job are skipped.
+
+        A copy read from a cache may be stale when the row no longer is, because a worker
+        has refreshed it since. Those are evicted from this process' artwork cache rather
+        than queued again, so a refresh doesn't start another one on the next read.
+        """
+        cutoff = ArtworkHydrationService.refresh_cutoff()
+        due, fresh = [], []
+        for pk, external_id, status, fetched_at in (
+            Artwork.objects.filter(pk__in=artwork_ids).values_list("pk", "external_id", "status", "fetched_at")
+        ):
+            if ArtworkHydrationService.is_stale(status, fetched_at, cutoff):
+                due.append(pk)
+            else:
+                fresh.append(external_id)
+
+        ArtworkHydrationJob.objects.bulk_create([ArtworkHydrationJob(artwork_id=pk) for pk in due], ignore_conflicts=True)
+        get_artwork_cache().invalidate(fresh)
 
-class ProjectService:
     @staticmethod
-    def sync_completion(project_id: int) -> Project:
+    def claim(owner: str, limit: int = BATCH_SIZE):
+        """Lease up to `limit` due jobs to `owner` and return them with their artworks."""
+        now = timezone.now()
+        due = (
+            ArtworkHydrationJob.objects
+            .filter(status=ArtworkHydrationJob.Status.QUEUED, run_after__lte=now)
+            .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        )
+        candidates = list(due.order_by("run_after").values_list("pk", flat=True)[:limit])
+        if not candidates:
+            return []
+
+        # Conditional on the job still being free, so concurrent claimers can't both win it
+        due.filter(pk__in=candidates).update(
+            owner=owner,
+            locked_until=now + timedelta(seconds=ArtworkHydrationService.LEASE),
+        )
+        return list(ArtworkHydrationJob.objects.filter(pk__in=candidates, owner=owner).select_related("artwork"))
+
+    @staticmethod
+    def run(jobs):
         """
-        Recalculate and persist Project completion state based on its ProjectArtwork rows.
+        Fetch metadata for claimed jobs and apply the outcome.
+
+        Hydrated artworks become ready and their jobs are deleted. Upstream 404s fail
+        the artwork straight away; other errors are retried with exponential backoff
+        until MAX_ATTEMPTS. Calls refused by the client's circuit breaker or rate limiter
+        are retried once it allows calls again.
+
+        A refresh that fails for good keeps the artwork as it is, and it is only tried
+        again once it has gone stale once more. Projects are only bumped for artworks
+        whose metadata actually changed.
 
-        Must be called inside transaction.atomic() if you want race-safety.
+        Returns:
+            tuple: (hydrated, retried, failed) job counts
         """
-        project = Project.objects.select_for_update().get(pk=project_id)
+        if not jobs:
+            return 0, 0, 0
+
+        by_external = {job.artwork.external_id: job for job in jobs}
+        created_artworks, fetch_errors = ArtworkService.fetch_missing_artworks(list(by_external))
+        now = timezone.now()
+
+        hydrated, changed = [], []
+        for fetched in created_artworks:
+            artwork = by_external[fetched.external_id].artwork
+            if (artwork.status, artwork.title, artwork.license_id) != (
+                Artwork.Status.READY, fetched.title, fetched.license_id,
+            ):
+                changed.append(artwork)
+            artwork.title = fetched.title
+            artwork.license = fetched.license
+            artwork.status = Artwork.Status.READY
+            artwork.fetched_at = now
+            hydrated.append(artwork)
 
-        any_unvisited = ProjectArtwork.objects.filter(project_id=project_id, visited=False).exists()
+        retried, failed, given_up = [], [], []
+        for error in fetch_errors:
+            job = by_external[error["id"]]
+            job.last_error = str(error.get("status_code") or error.get("error") or "")[:1000]
+            job.owner, job.locked_until = "", None
+
+            if "retry_after" in error:
+                # Circuit open or rate limited: the artwork isn't at fault, so this costs no attempt
+                job.run_after = now + timedelta(seconds=error["retry_after"] * random.uniform(1, 1.1))
+                retried.append(job)
+                continue
+
+            job.attempts += 1
+            if error.get("status_code") == 404 or job.attempts >= ArtworkHydrationService.MAX_ATTEMPTS:
+                if job.artwork.status == Artwork.Status.READY:
+                    # Failed refresh: keep serving what we have until it goes stale again
+                    job.artwork.fetched_at = now
+                    given_up.append(job.artwork)
+                else:
+                    job.status = ArtworkHydrationJob.Status.FAILED
+                    job.artwork.status = Artwork.Status.FAILED
+                    failed.append(job)
+            else:
+                delay = min(
+                    ArtworkHydrationService.BACKOFF_BASE * 2 ** (job.attempts - 1),
+                    ArtworkHydrationService.BACKOFF_MAX,
+                )
+                job.run_after = now + timedelta(seconds=delay * random.uniform(1, 1.1))
+                retried.append(job)
 
-        if not any_unvisited:
-            if not project.is_completed:
-                project.is_completed = True
-                project.save(update_fields=["is_completed"])
-        else:
-            if project.is_completed:
-                project.is_completed = False
-                project.save(update_fields=["is_completed"])
+        save_licenses(a.license for a in hydrated)
+        with transaction.atomic():
+            Artwork.objects.bulk_update(
+                hydrated + [job.artwork for job in failed],
+                ["title", "license", "status", "fetched_at"],
+            )
+            Artwork.objects.bulk_update(given_up, ["fetched_at"])
+            ArtworkHydrationJob.objects.filter(artwork__in=hydrated + given_up).delete()
+            ArtworkHydrationJob.objects.bulk_update(
+                retried + failed,
+                ["status", "attempts", "run_after", "owner", "locked_until", "last_error"],
+            )
 
+            # Rendered projects showing the old metadata are now out of date
+            ProjectService.touch_for_artworks(changed + [job.artwork for job in failed])
+
+        # Refreshed rows have a new fetched_at even when nothing else changed; cached copies
+        # with the old one would look stale and queue the refresh again
+        get_artwork_cache().invalidate(a.external_id for a in hydrated + given_up)
+        return len(hydrated), len(retried), len(failed) + len(given_up)
+
+
+class ProjectService:
+    @staticmethod
+    def create_project(*, name, description=None, start_date=None, artworks=()) -> Project:
+        """
+        Create a project with the given artworks as its places, in order.
+        Must be called inside transaction.atomic().
+        """
+        project = Project.objects.create(
+            name=name,
+            description=description,
+            start_date=start_date,
+            places_count=len(artworks),
+        )
+        ProjectArtwork.objects.bulk_create(
+            [ProjectArtwork(project=project, artwork=artwork) for artwork in artworks],
+            ignore_conflicts=True,
+        )
         return project
 
+    @staticmethod
+    def bulk_create_projects(definitions, chunk_size: int = 500):
+        """
+        Create many projects, each as create_project would, with one artwork lookup for all of them.
+
+        The union of their artwork ids is resolved once, so each missing artwork is fetched
+        once, in batched upstream requests. The lookup has an import's budget rather than a
+        request's (get_artworks with bulk=True), so large imports aren't cut short by the
+        rate limiter. Projects and places are then inserted with bulk_create, one
+        transaction per chunk of projects.
+
+        Args:
+            definitions: Validated ProjectCreateSerializer data, one per project
+
+        Returns:
+            list: (project, fetch_errors) per definition, in order
+        """
+        artwork_ids = list(dict.fromkeys(aid for d in definitions for aid in d["artwork_ids"]))
+        by_external, fetch_errors = ArtworkService.get_artworks(artwork_ids, bulk=True) if artwork_ids else ({}, [])
+        errors_by_id = {e["id"]: e for e in fetch_errors}
+
+        results = []
+        for start in range(0, len(definitions), chunk_size):
+            chunk = definitions[start:start + chunk_size]
+            places = [[by_external[aid] for aid in d["artwork_ids"] if aid in by_external] for d in chunk]
+            projects = [
+                Project(
+                    name=d["name"],
+                    description=d.get("description"),
+                    start_date=d.get("start_date"),
+                    places_count=len(artworks),
+                )
+                for d, artworks in zip(chunk, places)
+            ]
+
+            with transaction.atomic():
+                Project.objects.bulk_create(projects)
+                ProjectArtwork.objects.bulk_create(
+                    [
+                        ProjectArtwork(project=project, artwork=artwork)
+                        for project, artworks in zip(projects, places)
+                        for artwork in artworks
+                    ]
+                )
+
+            results.extend(
+                (project, [errors_by_id[aid] for aid in d["artwork_ids"] if aid in errors_by_id])
+                for project, d in zip(projects, chunk)
+            )
+
+        return results
+
+    @staticmethod
+    def delete_project(project: Project) -> None:
+        """Delete a project and its places, leaving a tombstone for the change feed."""
+        with transaction.atomic():
+            Tombstone.objects.create(kind=Tombstone.Kind.PROJECT, object_id=project.pk)
+            project.delete()
+
+    @staticmethod
+    def is_completed(places_count: int, visited_count: int) -> bool:
+        """A project is completed once it has places and every one of them is visited."""
+        return 0 < places_count == visited_count
+
+    @staticmethod
+    def adjust_counters(project_id: int, *, places: int = 0, visited: int = 0) -> None:
+        """
+        Shift the denormalized place counters and re-derive is_completed, in one UPDATE.
+
+        Completion follows ProjectService.is_completed. Must be called in the same
+        transaction as the ProjectArtwork change it accounts for.
+        """
+        places_count = F("places_count") + places
+        visited_count = F("visited_count") + visited
+
+        Project.objects.filter(pk=project_id).update(
+            places_count=places_count,
+            visited_count=visited_count,
+            is_completed=Q(GreaterThan(places_count, 0), Exact(visited_count, places_count)),
+            version=F("version") + 1,
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def update_project(project_id: int, *, fields: dict, expected=None) -> bool:
+        """
+        Update a project's own fields in one UPDATE.
+
+        With expected=(version, places_version) the write only happens if neither the
+        project nor its places changed since they were read; returns False otherwise.
+        """
+        projects = Project.objects.filter(pk=project_id)
+        if expected is not None:
+            version, places_version = expected
+            projects = projects.with_places_version().filter(version=version, places_version=places_version)
+        return bool(projects.update(**fields, version=F("version") + 1, updated_at=timezone.now()))
+
+    @staticmethod
+    def touch_for_artworks(artworks) -> None:
+        """Bump every project and place that includes one of these artworks, e.g. after their metadata changed."""
+        now = timezone.now()
+        ProjectArtwork.objects.filter(artwork__in=artworks).update(version=F("version") + 1, updated_at=now)
+        Project.objects.filter(project_artworks__artwork__in=artworks).update(
+            version=F("version") + 1,
+            updated_at=now,
+        )
+
 
 class ProjectArtworkService:
     MAX_PLACES = 10
@@ -86,18 +740,93 @@ class ProjectArtworkService:
         Enforces MAX_PLACES and prevents duplicates.
         Must be called inside transaction.atomic().
         """
-        # Lock existing rows for race-safety on count and duplicates
-        ProjectArtwork.objects.select_for_update().filter(project=project)
+        # Lock the project row for race-safety on the place count
+        places_count = (
+            Project.objects
+            .select_for_update()
+            .values_list("places_count", flat=True)
+            .get(pk=project.pk)
+        )
 
-        if ProjectArtwork.objects.filter(project=project, artwork=artwork).exists():
-            return False
-
-        if ProjectArtwork.objects.filter(project=project).count() >= ProjectArtworkService.MAX_PLACES:
+        if places_count >= ProjectArtworkService.MAX_PLACES:
+            if ProjectArtwork.objects.filter(project=project, artwork=artwork).exists():
+                return False
             raise ValueError({"detail": f"A project can contain at most {ProjectArtworkService.MAX_PLACES} places."})
 
         try:
-            ProjectArtwork.objects.create(project=project, artwork=artwork, notes="", visited=False)
+            # Savepoint, so a duplicate doesn't break the caller's transaction
+            with transaction.atomic():
+                ProjectArtwork.objects.create(project=project, artwork=artwork, notes="", visited=False)
         except IntegrityError:
             return False
 
-        return True
\ No newline at end of file
+        ProjectService.adjust_counters(project.pk, places=1)
+        return True
+
+    @staticmethod
+    def bulk_update_places(*, project: Project, updates: list) -> None:
+        """
+        Apply many place updates with one bulk_update and at most one counter update.
+
+        Args:
+            project: Project whose places are updated
+            updates: List of {"artwork_id", "notes"?, "visited"?}, artwork_id = Artwork.external_id
+
+        Raises ValueError if any artwork is not a place in the project.
+        Must be called inside transaction.atomic().
+        """
+        by_external = {item["artwork_id"]: item for item in updates}
+        # Locks only these places, in pk order so concurrent bulk updates can't deadlock;
+        # the project row is locked by adjust_counters, and only if a visited flag flips
+        links = list(
+            ProjectArtwork.objects
+            .select_for_update(of=("self",))
+            .filter(project=project, artwork__external_id__in=by_external)
+            .select_related("artwork")
+            .order_by("pk")
+        )
+
+        found = {link.artwork.external_id for link in links}
+        missing = [aid for aid in by_external if aid not in found]
+        if missing:
+            raise ValueError({"detail": "Some artworks are not places in this project.", "missing": missing})
+
+        now = timezone.now()
+        visited_delta = 0
+        for link in links:
+            item = by_external[link.artwork.external_id]
+            if "notes" in item:
+                link.notes = item["notes"]
+            if "visited" in item and item["visited"] != link.visited:
+                visited_delta += 1 if item["visited"] else -1
+                link.visited = item["visited"]
+            link.updated_at = now
+            link.version = F("version") + 1
+
+        ProjectArtwork.objects.bulk_update(links, ["notes", "visited", "updated_at", "version"])
+
+        if visited_delta:
+            ProjectService.adjust_counters(project.pk, visited=visited_delta)
+
+    @staticmethod
+    def update_place(*, project_id: int, link_id: int, version: int, visited: bool, changes: dict) -> bool:
+        """
+        Apply {"notes"?, "visited"?} to a place, if it is still at `version`.
+
+        One conditional UPDATE and no lock on the place beforehand: returns False if it
+        changed since it was read (then `visited` may be stale too). The project's counters,
+        and so its row lock, are only touched when the visited flag flips; other edits show
+        in the project's ETag through the place version.
+        Must be called inside transaction.atomic().
+        """
+        updated = ProjectArtwork.objects.filter(pk=link_id, version=version).update(
+            **changes,
+            version=F("version") + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return False
+
+        if "visited" in changes and changes["visited"] != visited:
+            ProjectService.adjust_counters(project_id, visited=1 if changes["visited"] else -1)
+        return True
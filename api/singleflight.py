@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import Future, TimeoutError
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same keys within a process.
+
+    The first caller for a key runs the work; callers arriving while it is in flight
+    wait for that result instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do_many(self, keys, fn, timeout=None, on_timeout=None):
+        """
+        Run fn for the keys nobody else is working on, and wait for the rest.
+
+        Args:
+            keys: Hashable keys to resolve
+            fn: Callable taking a list of keys and returning a dict key -> result
+            timeout: Seconds, counted from the call, to wait for results owned by other callers
+            on_timeout: Callable key -> result used when that wait times out
+
+        Returns:
+            dict: key -> result for every key (None if fn returned nothing for it)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        owned = []
+        waiting = {}
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    self._calls[key] = future
+                    owned.append(key)
+                else:
+                    waiting[key] = future
+
+        results = {}
+        if owned:
+            try:
+                results = fn(owned)
+            except BaseException as e:
+                self._finish(owned, error=e)
+                raise
+            self._finish(owned, results=results)
+
+        for key, future in waiting.items():
+            try:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                results[key] = future.result(timeout=remaining)
+            except TimeoutError:
+                if on_timeout is None:
+                    raise
+                results[key] = on_timeout(key)
+
+        return {key: results.get(key) for key in keys}
+
+    def _finish(self, keys, results=None, error=None):
+        with self._lock:
+            futures = [self._calls.pop(key) for key in keys]
+        for key, future in zip(keys, futures):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(key))
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: callers on the same event loop share in-flight work.
+    """
+
+    def __init__(self):
+        # Futures belong to one event loop, so in-flight calls are tracked per loop
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do_many(self, keys, fn, timeout=None, on_timeout=None):
+        """
+        Async counterpart of SingleFlight.do_many; fn is a coroutine function.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        calls = self._calls.setdefault(loop, {})
+
+        owned = []
+        waiting = {}
+        for key in keys:
+            future = calls.get(key)
+            if future is None:
+                calls[key] = loop.create_future()
+                owned.append(key)
+            else:
+                waiting[key] = future
+
+        results = {}
+        if owned:
+            try:
+                results = await fn(owned)
+            except BaseException as e:
+                self._finish(calls, owned, error=e)
+                raise
+            self._finish(calls, owned, results=results)
+
+        for key, future in waiting.items():
+            try:
+                remaining = None if deadline is None else max(0, deadline - loop.time())
+                results[key] = await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                if on_timeout is None:
+                    raise
+                results[key] = on_timeout(key)
+
+        return {key: results.get(key) for key in keys}
+
+    @staticmethod
+    def _finish(calls, keys, results=None, error=None):
+        for key in keys:
+            future = calls.pop(key)
+            if isinstance(error, asyncio.CancelledError):
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+                # Mark retrieved: the owner re-raises it, waiters may not exist
+                future.exception()
+            else:
+                future.set_result(results.get(key))
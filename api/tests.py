@@ -1,3 +1,1095 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import fast_serializers
+from .cache import ArtworkCache, LocMemArtworkCacheBackend, get_artwork_cache
+from .clients import ArticClient
+from .licenses import license_for, save_licenses
+from .models import Artwork, ArtworkFetchLock, ArtworkHydrationJob, License, Project, ProjectArtwork
+from .resilience import CircuitBreaker, TokenBucket
+from .serializers import ProjectArtworkSerializer, ProjectSerializer
+from .services import ArtworkHydrationService, ArtworkService, ProjectArtworkService
+from .singleflight import SingleFlight
+from .sync import ChangeFeed
+
+
+def make_license(text):
+    license = license_for(text)
+    save_licenses([license])
+    return license
+
+
+def make_project(places: int, **kwargs) -> Project:
+    project = Project.objects.create(name=kwargs.pop("name", "Tour"), places_count=places, **kwargs)
+    start = Artwork.objects.count() + 1
+    license = make_license("CC0")
+    artworks = Artwork.objects.bulk_create(
+        Artwork(external_id=start + i, title=f"Artwork {start + i}", license=license, fetched_at=timezone.now())
+        for i in range(places)
+    )
+    ProjectArtwork.objects.bulk_create(ProjectArtwork(project=project, artwork=a) for a in artworks)
+    return project
+
+
+@override_settings(PERFORMANCE={"LOG_REQUESTS": False, "SLOW_REQUEST_MS": None})
+class APITestCase(TestCase):
+    def setUp(self):
+        # Primary keys are reused between tests, so cached renderings must not survive them
+        caches["default"].clear()
+        get_artwork_cache().clear()
+        self.client = APIClient()
+
+
+class ProjectQueryCountTests(APITestCase):
+    def test_project_detail_query_count_does_not_grow_with_places(self):
+        small = make_project(places=1)
+        large = make_project(places=10)
+
+        for project in (small, large):
+            # version + project + places joined with artworks
+            with self.assertNumQueries(3):
+                response = self.client.get(reverse("project-detail", args=[project.pk]))
+            self.assertEqual(response.status_code, 200)
+
+            # rendered body cached under the current version
+            with self.assertNumQueries(1):
+                self.client.get(reverse("project-detail", args=[project.pk]))
+
+        self.assertEqual(len(response.json()["artworks"]), 10)
+
+    def test_place_list_query_count_does_not_grow_with_places(self):
+        small = make_project(places=1)
+        large = make_project(places=10)
+
+        for project in (small, large):
+            # version + places joined with artworks
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse("project-artwork-list", args=[project.pk]))
+            self.assertEqual(response.status_code, 200)
+
+
+class ProjectListTests(APITestCase):
+    def test_cursor_pagination_walks_all_projects_newest_first(self):
+        projects = [make_project(places=3, name=f"Tour {i}") for i in range(5)]
+
+        seen = []
+        url = reverse("project-list-create") + "?limit=2"
+        while url:
+            # page of projects + their places
+            with self.assertNumQueries(2):
+                body = self.client.get(url).json()
+            seen.extend(p["id"] for p in body["results"])
+            url = body["next"]
+
+        self.assertEqual(seen, [p.pk for p in reversed(projects)])
+
+    def test_filters(self):
+        done = make_project(places=1, is_completed=True, start_date="2026-05-01")
+        make_project(places=1, start_date="2026-01-01")
+
+        response = self.client.get(reverse("project-list-create"), {"is_completed": "true"})
+        self.assertEqual([p["id"] for p in response.json()["results"]], [done.pk])
+
+        response = self.client.get(reverse("project-list-create"), {"start_date_after": "2026-03-01"})
+        self.assertEqual([p["id"] for p in response.json()["results"]], [done.pk])
+
+
+class ImportArtworksTests(APITestCase):
+    def import_catalog(self, *args):
+        call_command("import_artworks", *args, stdout=io.StringIO())
+
+    def test_upserts_and_only_touches_projects_whose_artworks_changed(self):
+        same, renamed = make_project(places=1), make_project(places=1)
+        records = [
+            {"id": same.artworks.get().external_id, "title": same.artworks.get().title},
+            {"id": renamed.artworks.get().external_id, "title": "Renamed"},
+            {"id": 9001, "title": "New", "license_text": "Public domain"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "catalog.jsonl"
+            path.write_text("\n".join(json.dumps(r) for r in records))
+            self.import_catalog(str(path), "--license-text", "CC0")
+
+        self.assertEqual(renamed.artworks.get().title, "Renamed")
+        new = Artwork.objects.get(external_id=9001)
+        self.assertEqual((new.title, new.license_text, new.status), ("New", "Public domain", Artwork.Status.READY))
+
+        versions = dict(Project.objects.values_list("pk", "version"))
+        self.assertEqual((versions[same.pk], versions[renamed.pk]), (same.version, renamed.version + 1))
+
+    def test_bad_ids_are_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ids.txt"
+            path.write_text("1, 2\nthree\n")
+            with self.assertRaisesMessage(CommandError, "'three' is not an artwork id"):
+                self.import_catalog("--ids", str(path))
+
+
+@mock.patch.object(ChangeFeed, "SAFETY_LAG", 0)
+class RepairPlaceCountersTests(APITestCase):
+    def repair(self, *args):
+        out = io.StringIO()
+        call_command("repair_place_counters", *args, stdout=out)
+        return out.getvalue()
+
+    def test_repairs_drifted_counters_and_reports_them_to_sync(self):
+        drifted = make_project(places=2)
+        drifted.project_artworks.update(visited=True)
+        # No places, as when every artwork of a new project failed to fetch
+        empty, wrongly_completed = make_project(places=0), make_project(places=0, is_completed=True)
+        cursor = self.client.get(reverse("sync-feed")).json()["cursor"]
+
+        self.assertIn("would repair 2", self.repair("--dry-run"))
+        self.assertEqual(Project.objects.get(pk=drifted.pk).visited_count, 0)
+
+        self.assertIn("Checked 3 projects, repaired 2.", self.repair())
+        counters = {
+            p.pk: (p.places_count, p.visited_count, p.is_completed)
+            for p in Project.objects.only("places_count", "visited_count", "is_completed")
+        }
+        self.assertEqual(counters, {
+            drifted.pk: (2, 2, True), empty.pk: (0, 0, False), wrongly_completed.pk: (0, 0, False),
+        })
+        self.assertEqual(Project.objects.get(pk=drifted.pk).version, drifted.version + 1)
+
+        synced = self.client.get(reverse("sync-feed"), {"since": cursor}).json()["projects"]
+        self.assertEqual(sorted(p["id"] for p in synced), [drifted.pk, wrongly_completed.pk])
+        self.assertIn("repaired 0", self.repair())
+
+
+class ArtworkSearchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        public_domain = make_license("Public domain")
+        Artwork.objects.bulk_create([
+            Artwork(external_id=1, title="Water Lilies", license=public_domain),
+            Artwork(external_id=2, title="The Bedroom", license=make_license("Lilies pictured on request")),
+            Artwork(external_id=3, title="Nighthawks", license=public_domain),
+            Artwork(external_id=4, title="Artwork 4", status=Artwork.Status.PENDING),
+        ])
+
+    def search(self, **params):
+        response = self.client.get(reverse("artwork-search"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_prefix_match_ranks_title_above_license_text(self):
+        results = self.search(q="lil")["results"]
+        self.assertEqual([a["external_id"] for a in results], [1, 2])
+
+        self.assertEqual([a["external_id"] for a in self.search(q="night")["results"]], [3])
+        self.assertEqual(self.search(q="water night")["results"], [])
+        # Placeholders have no real title yet
+        self.assertEqual(self.search(q="artwork")["results"], [])
+
+    def test_index_follows_writes(self):
+        Artwork.objects.filter(external_id=3).update(title="Automat")
+        self.assertEqual(self.search(q="night")["results"], [])
+        self.assertEqual([a["external_id"] for a in self.search(q="automat")["results"]], [3])
+
+    def test_other_backends_fall_back_to_substring_matching(self):
+        with mock.patch.object(connections["default"], "vendor", "mysql"):
+            self.assertEqual([a["external_id"] for a in self.search(q="lil")["results"]], [1, 2])
+            self.assertEqual(self.search(q="water night")["results"], [])
+            # Substrings match anywhere, not just at word starts
+            self.assertEqual([a["external_id"] for a in self.search(q="ighthawk")["results"]], [3])
+
+            seen = []
+            url = reverse("artwork-search") + "?q=public&limit=1"
+            while url:
+                body = self.client.get(url).json()
+                seen.extend(a["external_id"] for a in body["results"])
+                url = body["next"]
+        self.assertEqual(seen, [1, 3])
+
+    def test_cursor_walks_all_results(self):
+        seen = []
+        url = reverse("artwork-search") + "?q=public&limit=1"
+        while url:
+            body = self.client.get(url).json()
+            seen.extend(a["external_id"] for a in body["results"])
+            url = body["next"]
+        self.assertEqual(sorted(seen), [1, 3])
+        self.assertEqual(len(seen), 2)
+
+
+class InstrumentationTests(APITestCase):
+    def test_server_timing_and_metrics(self):
+        project = make_project(places=2)
+
+        response = self.client.get(reverse("project-detail", args=[project.pk]))
+        timing = response["Server-Timing"]
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="3 calls"', timing)
+        self.assertIn("serialize;dur=", timing)
+
+        metrics = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="project-detail",method="GET"}', metrics)
+        self.assertIn('http_request_component_calls_total{view="project-detail",component="db"}', metrics)
+
+    @override_settings(PERFORMANCE={"LOG_REQUESTS": False, "SLOW_REQUEST_MS": 0})
+    def test_slow_requests_log_their_queries(self):
+        project = make_project(places=1)
+        with self.assertLogs("api.performance", "WARNING") as logs:
+            self.client.get(reverse("project-detail", args=[project.pk]))
+        self.assertIn("api_project", logs.output[0])
+
+
+class ArticClientResilienceTests(SimpleTestCase):
+    def respond(self, status_code, headers=None):
+        return mock.Mock(status_code=status_code, headers=headers or {}, json=lambda: {"data": [{"id": 1, "title": "A"}]})
+
+    def test_circuit_opens_on_failures_and_fails_fast(self):
+        client = ArticClient(breaker=CircuitBreaker(min_calls=3, open_seconds=60))
+        with mock.patch.object(client.session, "get", return_value=self.respond(503)) as get, \
+                self.assertLogs("api.resilience", "WARNING"):
+            for _ in range(5):
+                found, errors = client.fetch_batch([1])
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(found, {})
+        self.assertGreater(errors[0]["retry_after"], 0)
+
+    def test_half_open_probe_closes_circuit(self):
+        client = ArticClient(breaker=CircuitBreaker(min_calls=1, open_seconds=0))
+        with mock.patch.object(client.session, "get", side_effect=[self.respond(503), self.respond(200)]), \
+                self.assertLogs("api.resilience", "WARNING"):
+            client.fetch_batch([1])
+            found, errors = client.fetch_batch([1])
+        self.assertEqual((list(found), errors), ([1], []))
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_429_pauses_calls_for_retry_after(self):
+        client = ArticClient()
+        with mock.patch.object(client.session, "get", return_value=self.respond(429, {"Retry-After": "30"})) as get:
+            _, errors = client.fetch_batch([1])
+            self.assertEqual(errors, [{"id": 1, "status_code": 429, "retry_after": 30.0}])
+
+            _, errors = client.fetch_batch([1])
+        self.assertEqual(get.call_count, 1)
+        self.assertGreater(errors[0]["retry_after"], 25)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+
+class ArtworkCacheTests(SimpleTestCase):
+    def test_entries_expire_and_not_found_ones_sooner(self):
+        cache = ArtworkCache(LocMemArtworkCacheBackend(), ttl=60, negative_ttl=5)
+        with mock.patch("api.cache.time.monotonic", return_value=1000):
+            cache.set_artworks([Artwork(id=7, external_id=1, title="Cached")])
+            cache.set_not_found([2])
+
+        with mock.patch("api.cache.time.monotonic", return_value=1004):
+            artworks, not_found = cache.get_many([1, 2, 3])
+        self.assertEqual(({aid: a.title for aid, a in artworks.items()}, not_found), ({1: "Cached"}, [2]))
+        self.assertEqual((artworks[1].pk, artworks[1]._state.adding), (7, False))
+
+        with mock.patch("api.cache.time.monotonic", return_value=1005):
+            self.assertEqual(list(cache.get_many([1, 2])[0]), [1])
+            self.assertEqual(cache.get_many([1, 2])[1], [])
+
+        with mock.patch("api.cache.time.monotonic", return_value=1060):
+            self.assertEqual(cache.get_many([1, 2]), ({}, []))
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        backend = LocMemArtworkCacheBackend(max_entries=2)
+        backend.set_many({1: "a", 2: "b"}, timeout=60)
+        backend.get_many([1])
+        backend.set_many({3: "c"}, timeout=60)
+
+        self.assertEqual(backend.get_many([1, 2, 3]), {1: "a", 3: "c"})
+
+
+class ArtworkFetchTests(SimpleTestCase):
+    @mock.patch.object(ArticClient, "BATCH_SIZE", 2)
+    @mock.patch.object(ArtworkService, "FETCH_DEADLINE", 0.3)
+    def test_batches_run_concurrently_and_stragglers_do_not_block(self):
+        release = threading.Event()
+
+        def fetch_batch(ids, max_queue_wait=None):
+            if 5 in ids:
+                release.wait(5)
+            else:
+                time.sleep(0.15)
+            return {aid: {"title": f"Artwork {aid}", "license_text": ""} for aid in ids}, []
+
+        began = time.monotonic()
+        with mock.patch.object(ArticClient, "fetch_batch", side_effect=fetch_batch):
+            created, errors = ArtworkService.fetch_missing_artworks([1, 2, 3, 4, 5])
+        elapsed = time.monotonic() - began
+        release.set()
+
+        # Two 0.15s batches in sequence would not have made the deadline
+        self.assertEqual([a.external_id for a in created], [1, 2, 3, 4])
+        self.assertEqual(errors, [{"id": 5, "error": "Timed out waiting for Art Institute API."}])
+        self.assertLess(elapsed, 0.45)
+
+    def test_ids_are_batched_and_ids_missing_from_a_batch_are_404s(self):
+        client = ArticClient()
+
+        def respond(url, params, timeout):
+            ids = [int(aid) for aid in params["ids"].split(",")]
+            data = [{"id": aid, "title": f"Artwork {aid}"} for aid in ids if aid % 50]
+            return mock.Mock(status_code=200, headers={}, json=lambda: {"data": data, "info": {"license_text": "CC0"}})
+
+        with mock.patch("api.services.get_artic_client", return_value=client), \
+                mock.patch.object(client.session, "get", side_effect=respond) as get:
+            created, errors = ArtworkService.fetch_missing_artworks(list(range(1, 251)))
+
+        batches = sorted(len(c.kwargs["params"]["ids"].split(",")) for c in get.call_args_list)
+        self.assertEqual(batches, [50, 100, 100])
+        self.assertTrue(all(c.kwargs["params"]["limit"] <= 100 for c in get.call_args_list))
+        self.assertEqual(len(created), 245)
+        self.assertEqual(created[0].license_text, "CC0")
+        self.assertEqual(errors, [{"id": aid, "status_code": 404} for aid in (50, 100, 150, 200, 250)])
+
+
+class FastSerializerParityTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = make_project(places=3, description=None, start_date="2026-02-04")
+        self.project.name = 'Tour "ü" \u2028 \u2029 \x00\x1f\t\\ 😀 </script>'
+        self.project.save()
+        links = list(self.project.project_artworks.select_related("artwork").order_by("id"))
+        links[0].notes = "line\nbreak \u2028"
+        links[0].visited = True
+        links[0].save()
+        links[1].artwork.title = "Ñu \u2029 \x7f"
+        links[1].artwork.license = None
+        links[1].artwork.status = Artwork.Status.PENDING
+        links[1].artwork.save()
+        self.artwork_id = links[0].artwork.external_id
+
+    def drf_bodies(self):
+        project = Project.objects.with_places().get(pk=self.project.pk)
+        places = list(project.project_artworks.all())
+        place = next(p for p in places if p.artwork.external_id == self.artwork_id)
+        render = JSONRenderer().render
+        return [
+            render(ProjectSerializer(project).data),
+            render(ProjectArtworkSerializer(places, many=True).data),
+            render(ProjectArtworkSerializer(place).data),
+        ]
+
+    def fast_bodies(self):
+        return [
+            fast_serializers.render_json(fast_serializers.project_data(self.project.pk)),
+            fast_serializers.render_json(fast_serializers.places_data(self.project.pk)),
+            fast_serializers.render_json(fast_serializers.place_data(self.project.pk, self.artwork_id)),
+        ]
+
+    def test_same_bytes_as_drf(self):
+        expected = self.drf_bodies()
+        self.assertEqual(self.fast_bodies(), expected)
+        with mock.patch.object(fast_serializers, "orjson", None):
+            self.assertEqual(self.fast_bodies(), expected)
+
+    def test_same_responses_as_drf(self):
+        urls = [
+            reverse("project-detail", args=[self.project.pk]),
+            reverse("project-artwork-list", args=[self.project.pk]),
+            reverse("project-artwork-detail", args=[self.project.pk, self.artwork_id]),
+            reverse("project-artwork-detail", args=[self.project.pk, 999_999]),
+        ]
+        urls += [f"{url}?compact=true" for url in urls[:3]]
+
+        bodies = {}
+        for fast in (True, False):
+            caches["default"].clear()
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                bodies[fast] = [(r.status_code, r["Content-Type"], r.content) for r in map(self.client.get, urls)]
+
+        self.assertEqual(bodies[True], bodies[False])
+        self.assertEqual([status for status, _, _ in bodies[True]], [200, 200, 200, 404, 200, 200, 200])
+
+
+class ConditionalGetTests(APITestCase):
+    def test_etag_revalidation_and_invalidation_on_write(self):
+        project = make_project(places=2)
+        url = reverse("project-detail", args=[project.pk])
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        external_id = project.artworks.first().external_id
+        self.client.patch(
+            reverse("project-artwork-detail", args=[project.pk, external_id]),
+            {"notes": "Bring binoculars"},
+            format="json",
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["artworks"][0]["notes"], "Bring binoculars")
+
+
+class OptimisticConcurrencyTests(APITestCase):
+    def test_if_match_rejects_stale_writes(self):
+        project = make_project(places=1)
+        url = reverse("project-artwork-detail", args=[project.pk, project.artworks.get().external_id])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.patch(url, {"notes": "First"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.patch(url, {"visited": True}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertFalse(self.client.get(url).json()["visited"])
+
+        response = self.client.patch(url, {"visited": True}, format="json", HTTP_IF_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_completed"])
+
+        detail = reverse("project-detail", args=[project.pk])
+        etag = self.client.get(detail)["ETag"]
+        self.client.patch(url, {"notes": "Second"}, format="json")
+        response = self.client.patch(detail, {"name": "Renamed"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(Project.objects.get(pk=project.pk).name, "Tour")
+
+
+class BulkPlaceUpdateTests(APITestCase):
+    def bulk_update(self, project, updates):
+        return self.client.patch(
+            reverse("project-artwork-bulk-update", args=[project.pk]), updates, format="json"
+        )
+
+    def test_toggles_visits_and_recomputes_completion_from_the_net_result(self):
+        project = make_project(places=3)
+        ids = list(project.artworks.order_by("external_id").values_list("external_id", flat=True))
+
+        response = self.bulk_update(project, [
+            {"artwork_id": ids[0], "visited": True, "notes": "Start here"},
+            {"artwork_id": ids[1], "visited": True},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["is_completed"])
+        places = {a["artwork"]["external_id"]: a for a in response.json()["artworks"]}
+        self.assertTrue(places[ids[0]]["visited"])
+        self.assertEqual(places[ids[0]]["notes"], "Start here")
+        self.assertFalse(places[ids[2]]["visited"])
+
+        # One unvisit and one visit: the count is unchanged, so the project stays incomplete
+        response = self.bulk_update(project, [
+            {"artwork_id": ids[0], "visited": False},
+            {"artwork_id": ids[2], "visited": True},
+        ])
+        self.assertFalse(response.json()["is_completed"])
+
+        response = self.bulk_update(project, [{"artwork_id": aid, "visited": True} for aid in ids])
+        self.assertTrue(response.json()["is_completed"])
+        project.refresh_from_db()
+        self.assertEqual((project.visited_count, project.is_completed), (3, True))
+
+        response = self.bulk_update(project, [{"artwork_id": ids[1], "visited": False}])
+        self.assertFalse(response.json()["is_completed"])
+
+    def test_rejects_unknown_and_duplicate_ids_without_changes(self):
+        project = make_project(places=2)
+        other = make_project(places=1)
+        aid = project.artworks.first().external_id
+
+        response = self.bulk_update(project, [
+            {"artwork_id": aid, "visited": True},
+            {"artwork_id": other.artworks.get().external_id, "visited": True},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["missing"], [other.artworks.get().external_id])
+
+        response = self.bulk_update(project, [{"artwork_id": aid, "visited": True}, {"artwork_id": aid}])
+        self.assertEqual(response.status_code, 400)
+
+        self.assertFalse(ProjectArtwork.objects.filter(visited=True).exists())
+
+    def test_query_count_does_not_grow_with_updates(self):
+        for places in (1, 10):
+            project = make_project(places=places)
+            updates = [
+                {"artwork_id": aid, "visited": True, "notes": "Seen"}
+                for aid in project.artworks.values_list("external_id", flat=True)
+            ]
+            # savepoint + project + locked places + bulk update + counters + release + re-read (project, places)
+            with self.assertNumQueries(8):
+                response = self.bulk_update(project, updates)
+            self.assertEqual(response.status_code, 200)
+
+
+class IdempotencyTests(APITestCase):
+    url = reverse_lazy("project-list-create")
+    body = {"name": "Tour", "artwork_ids": [1]}
+
+    def test_retries_replay_the_first_response(self):
+        Artwork.objects.create(external_id=1, title="Artwork 1")
+
+        first = self.client.post(self.url, self.body, format="json", HTTP_IDEMPOTENCY_KEY="k1")
+        with mock.patch("api.views.ArtworkService.get_artworks") as get_artworks:
+            retry = self.client.post(self.url, self.body, format="json", HTTP_IDEMPOTENCY_KEY="k1")
+        get_artworks.assert_not_called()
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Project.objects.count(), 1)
+
+        response = self.client.post(self.url, {**self.body, "name": "Other"}, format="json", HTTP_IDEMPOTENCY_KEY="k1")
+        self.assertEqual(response.status_code, 422)
+
+    @override_settings(IDEMPOTENCY={"WAIT": 0})
+    def test_duplicate_of_a_running_request_is_refused(self):
+        duplicates = []
+
+        def get_artworks(ids):
+            # The retry arrives while the first request is still waiting on the upstream
+            duplicates.append(self.client.post(self.url, self.body, format="json", HTTP_IDEMPOTENCY_KEY="k2"))
+            return {}, []
+
+        with mock.patch("api.views.ArtworkService.get_artworks", side_effect=get_artworks):
+            response = self.client.post(self.url, self.body, format="json", HTTP_IDEMPOTENCY_KEY="k2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(duplicates[0].status_code, 409)
+        self.assertEqual(Project.objects.count(), 1)
+
+
+class ProjectBulkCreateTests(APITestCase):
+    def test_creates_valid_projects_and_reports_invalid_ones(self):
+        Artwork.objects.bulk_create(Artwork(external_id=i, title=f"Artwork {i}") for i in (1, 2, 3))
+        body = "\n".join([
+            '{"name": "North", "artwork_ids": [1, 2]}',
+            '{"name": "", "artwork_ids": [1]}',
+            '{"name": "South", "artwork_ids": [2, 3, 2]}',
+        ])
+
+        with mock.patch(
+            "api.services.ArtworkService.get_artworks", wraps=ArtworkService.get_artworks
+        ) as get_artworks:
+            response = self.client.post(
+                reverse("project-bulk-create"), body, content_type="application/x-ndjson"
+            )
+        get_artworks.assert_called_once_with([1, 2, 3], bulk=True)
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data["created"], data["failed"]), (2, 1))
+        self.assertEqual([r["index"] for r in data["results"]], [0, 1, 2])
+        self.assertIn("name", data["results"][1]["errors"])
+
+        south = Project.objects.get(pk=data["results"][2]["id"])
+        self.assertEqual(south.places_count, 2)
+        self.assertEqual(list(south.artworks.order_by("external_id").values_list("external_id", flat=True)), [2, 3])
+
+    @mock.patch.object(ArticClient, "BATCH_SIZE", 2)
+    def test_imports_wait_for_the_rate_limiter_instead_of_dropping_places(self):
+        # Burst of 2 batches and no queueing for requests; the import needs 5 batches
+        client = ArticClient(limiter=TokenBucket(rate=20, burst=2), max_queue_wait=0)
+
+        def respond(url, params, timeout):
+            data = [{"id": int(aid), "title": f"Artwork {aid}"} for aid in params["ids"].split(",")]
+            return mock.Mock(status_code=200, headers={}, json=lambda: {"data": data})
+
+        records = [{"name": f"Tour {i}", "artwork_ids": [2 * i + 1, 2 * i + 2]} for i in range(5)]
+        err = io.StringIO()
+        with mock.patch("api.services.get_artic_client", return_value=client), \
+                mock.patch.object(client.session, "get", side_effect=respond) as get, \
+                tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "projects.ndjson"
+            path.write_text("\n".join(json.dumps(r) for r in records))
+            call_command("import_projects", str(path), stdout=io.StringIO(), stderr=err)
+            self.assertEqual(get.call_count, 5)
+
+            # A request-sized lookup of as many ids is refused by the limiter instead
+            _, errors = ArtworkService.get_artworks(list(range(11, 21)))
+
+        self.assertEqual(err.getvalue(), "")
+        self.assertEqual(sorted(Project.objects.values_list("places_count", flat=True)), [2] * 5)
+        self.assertIn("Art Institute API rate limit reached.", [e.get("error") for e in errors])
+
+
+class ProjectExportTests(APITestCase):
+    def test_ndjson_and_csv_exports(self):
+        projects = [make_project(places=2), make_project(places=0)]
+
+        response = self.client.get(reverse("project-export"))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        expected = ProjectSerializer(Project.objects.with_places().order_by("id"), many=True).data
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+        response = self.client.get(reverse("project-export"), {"output": "csv"})
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["project_id"] for row in rows], [str(projects[0].pk)] * 2 + [str(projects[1].pk)])
+        self.assertEqual(rows[2]["artwork_external_id"], "")
+
+
+@mock.patch.object(ChangeFeed, "SAFETY_LAG", 0)
+class SyncFeedTests(APITestCase):
+    url = reverse_lazy("sync-feed")
+
+    def sync(self, since=None, limit=100):
+        params = {"limit": limit, **({"since": since} if since else {})}
+        return self.client.get(self.url, params).json()
+
+    def test_feed_returns_changes_since_the_cursor(self):
+        kept, deleted = make_project(places=2), make_project(places=1)
+
+        # A full sync, one change per page, in the order they were made
+        changes, cursor, has_more = [], None, True
+        while has_more:
+            page = self.sync(cursor, limit=1)
+            changes += [(stream, len(page[stream])) for stream in ("projects", "places", "deleted") if page[stream]]
+            cursor, has_more = page["cursor"], page["has_more"]
+        self.assertEqual(changes, [("projects", 1), ("places", 1), ("places", 1), ("projects", 1), ("places", 1)])
+        self.assertEqual(self.sync(cursor)["cursor"], cursor)
+
+        place = kept.artworks.first()
+        self.client.patch(
+            reverse("project-artwork-detail", args=[kept.pk, place.external_id]), {"notes": "Hi"}, format="json"
+        )
+        self.client.delete(reverse("project-detail", args=[deleted.pk]))
+
+        page = self.sync(cursor)
+        self.assertEqual(page["projects"], [])
+        self.assertEqual([(p["project"], p["artwork"]["external_id"], p["notes"]) for p in page["places"]],
+                         [(kept.pk, place.external_id, "Hi")])
+        self.assertEqual([(d["type"], d["id"]) for d in page["deleted"]], [("project", deleted.pk)])
+        self.assertFalse(page["has_more"])
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch(keys):
+            calls.append(keys)
+            started.set()
+            release.wait(5)
+            return {key: key * 10 for key in keys}
+
+        results = {}
+        owner = threading.Thread(target=lambda: results.update(first=flight.do_many([1, 2], fetch)))
+        owner.start()
+        started.wait(5)
+        waiter = threading.Thread(target=lambda: results.update(second=flight.do_many([2, 3], fetch)))
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        owner.join(5)
+        waiter.join(5)
+
+        # The second caller only fetched the key nobody else was working on
+        self.assertEqual(calls, [[1, 2], [3]])
+        self.assertEqual(results, {"first": {1: 10, 2: 20}, "second": {2: 20, 3: 30}})
+
+    def test_timeout_covers_the_whole_call(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow(keys):
+            started.set()
+            release.wait(5)
+            return {key: "slow" for key in keys}
+
+        owner = threading.Thread(target=flight.do_many, args=([1], slow))
+        owner.start()
+        started.wait(5)
+
+        def fetch(keys):
+            time.sleep(0.2)
+            return {key: "own" for key in keys}
+
+        began = time.monotonic()
+        results = flight.do_many([1, 2], fetch, timeout=0.3, on_timeout=lambda key: "timed out")
+        elapsed = time.monotonic() - began
+        release.set()
+        owner.join(5)
+
+        self.assertEqual(results, {1: "timed out", 2: "own"})
+        self.assertLess(elapsed, 0.45)
+
+
+class ArtworkFetchLockTests(APITestCase):
+    def fetched(self, ids, timeout=None, max_queue_wait=None):
+        return [Artwork(external_id=aid, title=f"Artwork {aid}", fetched_at=timezone.now()) for aid in ids], []
+
+    def lock(self, *ids):
+        expires_at = timezone.now() + timedelta(minutes=1)
+        ArtworkFetchLock.objects.bulk_create(
+            ArtworkFetchLock(external_id=aid, owner="other", expires_at=expires_at) for aid in ids
+        )
+
+    def test_artworks_another_process_fetched_are_not_fetched_again(self):
+        self.lock(2)
+        Artwork.objects.create(external_id=2, title="Fetched elsewhere")
+
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", side_effect=self.fetched) as fetch:
+            results = ArtworkService._fetch_and_store([1, 2])
+
+        self.assertEqual(fetch.call_args.args, ([1],))
+        titles = {aid: artwork.title for aid, (artwork, _) in results.items()}
+        self.assertEqual(titles, {1: "Artwork 1", 2: "Fetched elsewhere"})
+        # Only this call's locks are released
+        self.assertEqual(list(ArtworkFetchLock.objects.values_list("external_id", flat=True)), [2])
+
+    def test_released_locks_are_fetched_here_within_the_same_deadline(self):
+        self.lock(2)
+
+        def release(seconds):
+            ArtworkFetchLock.objects.all().delete()
+
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", side_effect=self.fetched) as fetch, \
+                mock.patch("api.services.time.sleep", side_effect=release):
+            results = ArtworkService._fetch_and_store([2])
+
+        self.assertEqual(results[2][0].title, "Artwork 2")
+        self.assertLessEqual(fetch.call_args.kwargs["timeout"], ArtworkService.FETCH_DEADLINE)
+
+    @mock.patch.object(ArtworkService, "FETCH_DEADLINE", 0.3)
+    @mock.patch.object(ArtworkService, "LOCK_POLL_INTERVAL", 0.02)
+    def test_fetching_and_waiting_share_one_deadline(self):
+        self.lock(2)
+
+        def slow_fetch(ids, timeout=None, max_queue_wait=None):
+            time.sleep(0.2)
+            return self.fetched(ids)
+
+        began = time.monotonic()
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", side_effect=slow_fetch) as fetch:
+            results = ArtworkService._fetch_and_store([1, 2])
+        elapsed = time.monotonic() - began
+
+        # The other process never delivered, and the deadline left no time to fetch id 2 here
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(results[2], (None, {"id": 2, "error": "Timed out waiting for Art Institute API."}))
+        self.assertLess(elapsed, 0.45)
+
+
+class AsyncViewTests(APITestCase):
+    def fetched(self, *ids):
+        return [Artwork(external_id=aid, title=f"Artwork {aid}", license=license_for("CC0")) for aid in ids]
+
+    async def create(self, artwork_ids):
+        return await self.async_client.post(
+            reverse("async-project-create"), {"name": "Async tour", "artwork_ids": artwork_ids},
+            content_type="application/json",
+        )
+
+    async def test_create_and_add_place(self):
+        with mock.patch(
+            "api.services.ArtworkService.afetch_missing_artworks", return_value=(self.fetched(1, 2), [])
+        ):
+            response = await self.create([1, 2])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual([(a["artwork"]["external_id"], a["artwork"]["license_text"]) for a in body["artworks"]],
+                         [(1, "CC0"), (2, "CC0")])
+        self.assertNotIn("fetch_errors", body)
+
+        with mock.patch(
+            "api.services.ArtworkService.afetch_missing_artworks", return_value=(self.fetched(3), [])
+        ):
+            response = await self.async_client.post(
+                reverse("async-project-add-artwork", args=[body["id"]]), {"artwork_id": 3},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["added"], {"external_id": 3, "created_link": True})
+        self.assertEqual(await ProjectArtwork.objects.filter(project_id=body["id"]).acount(), 3)
+
+    async def test_upstream_errors_are_reported(self):
+        error = {"id": 2, "error": "Timed out waiting for Art Institute API."}
+        with mock.patch(
+            "api.services.ArtworkService.afetch_missing_artworks", return_value=(self.fetched(1), [error])
+        ):
+            response = await self.create([1, 2])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([a["artwork"]["external_id"] for a in response.json()["artworks"]], [1])
+        self.assertEqual(response.json()["fetch_errors"], [error])
+
+        project_id = response.json()["id"]
+        with mock.patch(
+            "api.services.ArtworkService.afetch_missing_artworks", return_value=([], [error])
+        ):
+            response = await self.async_client.post(
+                reverse("async-project-add-artwork", args=[project_id]), {"artwork_id": 2},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], [error])
+
+        response = await self.async_client.post(
+            reverse("async-project-add-artwork", args=[project_id + 1]), {"artwork_id": 2},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(ARTWORK_HYDRATION_MODE="async")
+    async def test_unknown_artworks_become_placeholders(self):
+        with mock.patch("api.services.ArtworkService.afetch_missing_artworks") as fetch:
+            response = await self.create([1])
+        fetch.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["artworks"][0]["artwork"]["status"], Artwork.Status.PENDING)
+        self.assertTrue(await ArtworkHydrationJob.objects.filter(artwork__external_id=1).aexists())
+
+
+class InlineThread:
+    """Stands in for threading.Thread, running the target on start() in the calling thread."""
+
+    def __init__(self, target, args=(), **kwargs):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+    def is_alive(self):
+        return False
+
+
+class ArtworkHydrationTests(APITestCase):
+    def run_jobs(self, errors=(), fetched=()):
+        with mock.patch(
+            "api.services.ArtworkService.fetch_missing_artworks", return_value=(list(fetched), list(errors))
+        ):
+            return ArtworkHydrationService.run(ArtworkHydrationService.claim("worker"))
+
+    def test_leases_lapse_so_a_crashed_workers_jobs_are_claimed_again(self):
+        ArtworkHydrationService.enqueue([1, 2])
+        self.assertEqual(len(ArtworkHydrationService.claim("a")), 2)
+        self.assertEqual(ArtworkHydrationService.claim("b"), [])
+
+        ArtworkHydrationJob.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([job.owner for job in ArtworkHydrationService.claim("b")], ["b", "b"])
+
+    def test_errors_back_off_until_attempts_run_out_and_404s_fail_at_once(self):
+        ArtworkHydrationService.enqueue([1, 2])
+        started = timezone.now()
+        self.assertEqual(self.run_jobs(errors=[{"id": 1, "status_code": 503}, {"id": 2, "status_code": 404}]), (0, 1, 1))
+
+        job = ArtworkHydrationJob.objects.get(artwork__external_id=1)
+        self.assertEqual((job.attempts, job.owner, job.locked_until), (1, "", None))
+        delay = (job.run_after - started).total_seconds()
+        self.assertTrue(ArtworkHydrationService.BACKOFF_BASE <= delay < ArtworkHydrationService.BACKOFF_BASE * 1.2)
+        self.assertEqual(Artwork.objects.get(external_id=2).status, Artwork.Status.FAILED)
+
+        # The next retry waits twice as long
+        ArtworkHydrationJob.objects.update(run_after=timezone.now())
+        started = timezone.now()
+        self.assertEqual(self.run_jobs(errors=[{"id": 1, "status_code": 503}]), (0, 1, 0))
+        delay = (ArtworkHydrationJob.objects.get(artwork__external_id=1).run_after - started).total_seconds()
+        self.assertTrue(2 * ArtworkHydrationService.BACKOFF_BASE <= delay < 2.4 * ArtworkHydrationService.BACKOFF_BASE)
+
+        ArtworkHydrationJob.objects.filter(artwork__external_id=1).update(
+            run_after=timezone.now(), attempts=ArtworkHydrationService.MAX_ATTEMPTS - 1,
+        )
+        self.assertEqual(self.run_jobs(errors=[{"id": 1, "status_code": 503}]), (0, 0, 1))
+        self.assertEqual(Artwork.objects.get(external_id=1).status, Artwork.Status.FAILED)
+
+    def test_failed_artworks_are_not_added_to_projects(self):
+        project = make_project(places=0)
+        Artwork.objects.create(external_id=777777, title="Artwork 777777", status=Artwork.Status.FAILED)
+
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks") as fetch:
+            response = self.client.post(
+                reverse("project-artwork-list", args=[project.pk]), {"artwork_id": 777777}, format="json"
+            )
+        fetch.assert_not_called()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["id"], 777777)
+        self.assertFalse(project.artworks.exists())
+
+    def test_hydrate_artworks_command_drains_the_queue(self):
+        ArtworkHydrationService.enqueue([1])
+        fetched = Artwork(external_id=1, title="Hydrated", license=license_for("CC0"))
+        out = io.StringIO()
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", return_value=([fetched], [])), \
+                mock.patch("api.management.commands.hydrate_artworks.threading.Thread", InlineThread):
+            call_command("hydrate_artworks", "--once", "--workers", "1", stdout=out)
+
+        artwork = Artwork.objects.get(external_id=1)
+        self.assertEqual((artwork.status, artwork.title, artwork.license_text), (Artwork.Status.READY, "Hydrated", "CC0"))
+        self.assertFalse(ArtworkHydrationJob.objects.exists())
+        self.assertIn("Hydrated 1, scheduled 0 retries, failed 0.", out.getvalue())
+
+
+class ArtworkRefreshTests(APITestCase):
+    def test_stale_artworks_are_served_then_refreshed_in_the_background(self):
+        project = make_project(places=1)
+        artwork = project.artworks.get()
+        Artwork.objects.filter(pk=artwork.pk).update(fetched_at=timezone.now() - timedelta(days=30))
+        etag = self.client.get(reverse("project-detail", args=[project.pk]))["ETag"]
+
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks") as fetch:
+            response = self.client.post(
+                reverse("project-artwork-list", args=[project.pk]), {"artwork_id": artwork.external_id}, format="json"
+            )
+        fetch.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+
+        fetched = Artwork(external_id=artwork.external_id, title="New title", license=license_for("CC0"))
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", return_value=([fetched], [])):
+            jobs = ArtworkHydrationService.claim("worker")
+            self.assertEqual(ArtworkHydrationService.run(jobs), (1, 0, 0))
+
+        artwork.refresh_from_db()
+        self.assertEqual(artwork.title, "New title")
+        self.assertGreater(artwork.fetched_at, timezone.now() - timedelta(minutes=1))
+        self.assertFalse(ArtworkHydrationJob.objects.exists())
+        response = self.client.get(reverse("project-detail", args=[project.pk]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_reads_queue_refreshes(self):
+        project = make_project(places=2)
+        Artwork.objects.update(fetched_at=timezone.now() - timedelta(days=30))
+
+        for fast in (True, False):
+            ArtworkHydrationJob.objects.all().delete()
+            caches["default"].clear()
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                self.client.get(reverse("project-detail", args=[project.pk]))
+            self.assertEqual(ArtworkHydrationJob.objects.count(), 2)
+
+        ArtworkHydrationJob.objects.all().delete()
+        self.client.get(reverse("project-list-create"))
+        self.assertEqual(ArtworkHydrationJob.objects.count(), 2)
+
+    def test_a_refresh_is_not_queued_again_once_done(self):
+        artwork = make_project(places=1).artworks.get()
+        Artwork.objects.filter(pk=artwork.pk).update(fetched_at=timezone.now() - timedelta(days=30))
+        ArtworkService.get_artworks([artwork.external_id])  # caches the stale row and queues a refresh
+        stale_copy, _ = get_artwork_cache().get_many([artwork.external_id])
+
+        unchanged = Artwork(external_id=artwork.external_id, title=artwork.title, license=license_for("CC0"))
+        with mock.patch("api.services.ArtworkService.fetch_missing_artworks", return_value=([unchanged], [])):
+            self.assertEqual(ArtworkHydrationService.run(ArtworkHydrationService.claim("worker")), (1, 0, 0))
+
+        ArtworkService.get_artworks([artwork.external_id])
+        self.assertFalse(ArtworkHydrationJob.objects.exists())
+
+        # Another process' cache still has the stale copy: the row is checked before queueing
+        get_artwork_cache().set_artworks(stale_copy.values())
+        ArtworkService.get_artworks([artwork.external_id])
+        self.assertFalse(ArtworkHydrationJob.objects.exists())
+        self.assertEqual(get_artwork_cache().get_many([artwork.external_id]), ({}, []))
+
+
+class LicenseTests(APITestCase):
+    def test_license_texts_are_stored_once_and_referenced_by_id_in_compact_mode(self):
+        text = "Creative Commons Zero. " * 20
+        found = {aid: {"title": f"Artwork {aid}", "license_text": text} for aid in (1, 2)}
+        with mock.patch.object(ArticClient, "fetch_batch", return_value=(found, [])):
+            response = self.client.post(
+                reverse("project-list-create"), {"name": "Tour", "artwork_ids": [1, 2]}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([p["artwork"]["license_text"] for p in response.json()["artworks"]], [text, text])
+        license = License.objects.get()
+
+        url = reverse("project-detail", args=[response.json()["id"]])
+        artworks = [p["artwork"] for p in self.client.get(url, {"compact": "true"}).json()["artworks"]]
+        self.assertEqual([a["license_id"] for a in artworks], [license.id, license.id])
+        self.assertNotIn("license_text", artworks[0])
+
+        response = self.client.get(reverse("license-detail", args=[license.id]))
+        self.assertEqual(response.json(), {"id": license.id, "text": text})
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_compact_and_full_shapes_have_their_own_etags(self):
+        project = make_project(places=1)
+        detail = reverse("project-detail", args=[project.pk])
+        place = reverse("project-artwork-detail", args=[project.pk, project.artworks.get().external_id])
+
+        for url, change in ((detail, {"name": "Stale"}), (place, {"notes": "Stale"})):
+            full, compact = self.client.get(url)["ETag"], self.client.get(url, {"compact": "true"})["ETag"]
+            self.assertNotEqual(full, compact)
+            self.assertEqual(self.client.get(url, {"compact": "true"}, HTTP_IF_NONE_MATCH=compact).status_code, 304)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=compact)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("license_text", response.content.decode())
+
+            # Writes are validated against the full shape only
+            self.assertEqual(self.client.patch(url, change, format="json", HTTP_IF_MATCH=compact).status_code, 412)
+            self.assertEqual(self.client.patch(url, change, format="json", HTTP_IF_MATCH=full).status_code, 200)
+
+
+@unittest.skipIf(
+    connection.vendor == "sqlite" and connection.settings_dict["TEST"]["NAME"] is None,
+    "the in-memory SQLite test database can't be shared between threads; set DB_TEST_NAME",
+)
+class PlaceLockingTests(TransactionTestCase):
+    """Runs against whichever backend is configured: row locks on PostgreSQL, BEGIN IMMEDIATE on SQLite."""
+
+    def run_concurrently(self, fn, args):
+        barrier = threading.Barrier(len(args))
+        results = [None] * len(args)
+
+        def worker(i, arg):
+            try:
+                barrier.wait()
+                with transaction.atomic():
+                    results[i] = fn(arg)
+            except Exception as e:
+                results[i] = e
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i, arg)) for i, arg in enumerate(args)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_adds_never_exceed_max_places(self):
+        project = make_project(places=ProjectArtworkService.MAX_PLACES - 1)
+        candidates = Artwork.objects.bulk_create(
+            Artwork(external_id=1000 + i, title=f"Extra {i}") for i in range(4)
+        )
+
+        def add(artwork):
+            try:
+                return ProjectArtworkService.add_artwork_to_project(project=project, artwork=artwork)
+            except ValueError:
+                return "full"
+
+        results = self.run_concurrently(add, candidates)
+
+        self.assertEqual(sorted(map(str, results)), ["True", "full", "full", "full"])
+        project.refresh_from_db()
+        self.assertEqual(project.places_count, ProjectArtworkService.MAX_PLACES)
+        self.assertEqual(project.project_artworks.count(), ProjectArtworkService.MAX_PLACES)
+
+    def test_concurrent_duplicate_adds_create_one_link(self):
+        project = make_project(places=1)
+        artwork = Artwork.objects.create(external_id=2000, title="Popular")
+
+        results = self.run_concurrently(
+            lambda a: ProjectArtworkService.add_artwork_to_project(project=project, artwork=a),
+            [artwork] * 4,
+        )
+
+        self.assertEqual(sorted(results), [False, False, False, True])
+        project.refresh_from_db()
+        self.assertEqual(project.places_count, 2)
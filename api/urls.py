@@ -1,30 +1,51 @@
 from django.urls import path
+from .async_views import AsyncProjectAddArtworkView, AsyncProjectCreateView
+from .idempotency import idempotent
 from .views import (
+    ArtworkSearchAPIView,
+    LicenseDetailAPIView,
+    ProjectBulkCreateAPIView,
     ProjectListCreateAPIView,
     ProjectDetailAPIView,
-    ProjectAddArtworkAPIView,
-    ProjectArtworkUpdateAPIView,
+    ProjectExportAPIView,
     ProjectArtworkListAPIView,
     ProjectArtworkDetailAPIView,
+    ProjectArtworkBulkUpdateAPIView,
+    SyncFeedAPIView,
 )
 
 urlpatterns = [
-    path("projects/", ProjectListCreateAPIView.as_view(), name="project-list-create"),
+    path("artworks/", ArtworkSearchAPIView.as_view(), name="artwork-search"),
+    path("licenses/<str:license_id>/", LicenseDetailAPIView.as_view(), name="license-detail"),
+    # POSTs here honour Idempotency-Key (api.idempotency)
+    path("projects/", idempotent(ProjectListCreateAPIView.as_view()), name="project-list-create"),
+    path("projects/bulk/", idempotent(ProjectBulkCreateAPIView.as_view()), name="project-bulk-create"),
+    path("projects/export/", ProjectExportAPIView.as_view(), name="project-export"),
     path("projects/<int:pk>/", ProjectDetailAPIView.as_view(), name="project-detail"),
-    path("projects/<int:project_id>/artworks/", ProjectAddArtworkAPIView.as_view(), name="project-add-artwork"),
-    path(
-        "projects/<int:project_id>/artworks/<int:artwork_id>/",
-        ProjectArtworkUpdateAPIView.as_view(),
-        name="project-artwork-update",
-    ),
+    # GET + POST (add place)
     path(
         "projects/<int:project_id>/artworks/",
-        ProjectArtworkListAPIView.as_view(),
+        idempotent(ProjectArtworkListAPIView.as_view()),
         name="project-artwork-list",
     ),
+    path(
+        "projects/<int:project_id>/artworks/bulk/",
+        ProjectArtworkBulkUpdateAPIView.as_view(),
+        name="project-artwork-bulk-update",
+    ),
+    # GET + PATCH (update place)
     path(
         "projects/<int:project_id>/artworks/<int:artwork_id>/",
         ProjectArtworkDetailAPIView.as_view(),
         name="project-artwork-detail",
     ),
-]
\ No newline at end of file
+    path("sync/", SyncFeedAPIView.as_view(), name="sync-feed"),
+
+    # Async-native write endpoints, for ASGI deployments
+    path("async/projects/", idempotent(AsyncProjectCreateView.as_view()), name="async-project-create"),
+    path(
+        "async/projects/<int:project_id>/artworks/",
+        idempotent(AsyncProjectAddArtworkView.as_view()),
+        name="async-project-add-artwork",
+    ),
+]
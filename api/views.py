@@ -1,32 +1,264 @@
+from django.conf import settings
 from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
-from .models import Artwork, Project, ProjectArtwork
+from . import export, fast_serializers, licenses
+from .cache import get_project_response_cache
+from .instrumentation import timed
+from .models import Project, ProjectArtwork
+from .pagination import KeysetPagination, SearchCursorPagination, SyncCursorPagination
+from .parsers import NDJSONParser
+from .search import ArtworkSearch
+from .sync import ChangeFeed
 from .serializers import (
+    ArtworkSearchSerializer,
+    ArtworkSerializer,
+    CompactModeSerializer,
+    LicenseSerializer,
     ProjectCreateSerializer,
+    ProjectExportSerializer,
+    ProjectListFilterSerializer,
     ProjectSerializer,
     ProjectUpdateSerializer,
     ProjectArtworkUpdateSerializer,
     ProjectAddArtworkSerializer,
-    ProjectArtworkSerializer
+    ProjectArtworkSerializer,
+    ProjectArtworkBulkUpdateListSerializer,
+    SyncFeedSerializer,
+    SyncPlaceSerializer,
+    SyncProjectSerializer,
+    SyncTombstoneSerializer,
+    validate_each,
 )
 
-from .services import ArtworkService, ProjectService, ProjectArtworkService
+from .services import ArtworkHydrationService, ArtworkService, ProjectService, ProjectArtworkService
+
+
+def serialize(serializer):
+    """serializer.data, timed as the request's serialize component."""
+    with timed("serialize"):
+        return serializer.data
+
+
+def refresh_stale_places(places):
+    """Queue background refreshes for the stale artworks of places being read."""
+    ArtworkHydrationService.refresh_stale([place.artwork for place in places])
+
+
+def compact_mode(request) -> bool:
+    """The ?compact= query parameter (see CompactModeSerializer)."""
+    params = CompactModeSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data["compact"]
+
+
+def _micros(dt):
+    return f"{int(dt.timestamp() * 1_000_000):x}"
+
+
+def get_project_state(project_id: int):
+    """
+    (version, places_version, token) of a project, in one query; Http404 if it doesn't exist.
+
+    The token changes whenever the project or any of its places changes.
+    """
+    row = (
+        Project.objects
+        .filter(pk=project_id)
+        .with_places_version()
+        .values_list("version", "places_version", "created_at")
+        .first()
+    )
+    if row is None:
+        raise Http404("No Project matches the given query.")
+
+    version, places_version, created_at = row
+    # created_at tells apart projects that reuse a deleted project's pk (possible on SQLite)
+    return version, places_version, f"{_micros(created_at)}.{version}.{places_version}"
+
+
+def get_place_state(project_id: int, artwork_id: int):
+    """(link id, version, visited, ETag) of a place, in one query; Http404 if it doesn't exist."""
+    row = (
+        ProjectArtwork.objects
+        .filter(project_id=project_id, artwork__external_id=artwork_id)
+        .values_list("id", "version", "visited", "created_at")
+        .first()
+    )
+    if row is None:
+        raise Http404("No ProjectArtwork matches the given query.")
+
+    link_id, version, visited, created_at = row
+    return link_id, version, visited, f'"place-{project_id}-{artwork_id}-{link_id}.{_micros(created_at)}.{version}"'
+
+
+def project_etag(project_id: int, token: str, variant: str) -> str:
+    return f'"project-{project_id}-{token}-{variant}"'
+
+
+def compact_etag(etag: str) -> str:
+    """ETag of the ?compact=true shape of a resource whose full shape has etag."""
+    return f'{etag[:-1]}-c"'
+
+
+def precondition_failed(request, etag: str) -> bool:
+    """True if the request carries an If-Match header that etag doesn't satisfy."""
+    header = request.headers.get("If-Match")
+    if header is None:
+        return False
+    if_match = parse_etags(header)
+    return not ("*" in if_match or etag in if_match)
+
+
+def precondition_failed_response(etag: str):
+    return Response(
+        {"detail": "The resource has changed since it was read; fetch it again and retry."},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+        headers={"ETag": etag},
+    )
+
+
+def conditional_response(request, etag: str, cache_key: tuple, render):
+    """
+    304 if the client's ETag is current, else the cached rendered body,
+    else render() once and cache the result under cache_key (project_id, version, variant).
+    """
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        return HttpResponseNotModified(headers={"ETag": etag})
+
+    cache = get_project_response_cache()
+    body = cache.get(*cache_key)
+    if body is None:
+        data = render()
+        with timed("serialize"):
+            if settings.FAST_READ_SERIALIZERS:
+                body = fast_serializers.render_json(data)
+            else:
+                body = JSONRenderer().render(data)
+        cache.set(*cache_key, body)
+
+    return HttpResponse(body, content_type="application/json", headers={"ETag": etag})
+
+
+def conditional_project_response(request, project_id: int, variant: str, render, compact=False):
+    """
+    Serve a read of project data by version (see conditional_response).
+
+    Costs one query (the version lookup) unless the body has to be rendered. Compact
+    bodies are a variant of their own, with their own ETag, so a validator of one
+    shape never validates the other; writes check If-Match against the full shape.
+    """
+    _, _, token = get_project_state(project_id)
+    etag = project_etag(project_id, token, variant)
+    if compact:
+        etag, variant = compact_etag(etag), f"{variant}-c"
+    return conditional_response(request, etag, (project_id, token, variant), render)
+
+
+class ArtworkSearchAPIView(APIView):
+    """
+    GET /api/artworks/?q=...  -> ranked search over locally known artworks (cursor-paginated)
+
+    Served from the local full-text index only; artworks never fetched from the
+    upstream are not found here.
+    """
+
+    @extend_schema(parameters=[ArtworkSearchSerializer], responses=ArtworkSerializer(many=True))
+    def get(self, request):
+        params = ArtworkSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data["q"]
+
+        paginator = SearchCursorPagination()
+        page = paginator.paginate_search(
+            lambda **kwargs: ArtworkSearch.search(query, **kwargs), request, view=self
+        )
+        ArtworkHydrationService.refresh_stale(page)
+        context = {"compact": params.validated_data["compact"]}
+        return paginator.get_paginated_response(serialize(ArtworkSerializer(page, many=True, context=context)))
+
+
+class LicenseDetailAPIView(APIView):
+    """
+    GET /api/licenses/<id>/
+    A license text, for clients reading artworks with ?compact=true. The id is a hash
+    of the text, so the response never changes and may be cached for good.
+    """
+
+    @extend_schema(responses=LicenseSerializer)
+    def get(self, request, license_id: str):
+        text = licenses.license_texts([license_id]).get(license_id)
+        if text is None:
+            raise Http404("No License matches the given query.")
+        return Response(
+            LicenseSerializer({"id": license_id, "text": text}).data,
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
+
+
+class SyncFeedAPIView(APIView):
+    """
+    GET /api/sync/?since=<cursor>&limit=100
+    Projects and places created or changed, and projects deleted, since the cursor (see api.sync).
+    Keep the returned `cursor` and pass it as `since` next time; while `has_more`, fetch again at once.
+    """
+
+    @extend_schema(parameters=[SyncFeedSerializer])
+    def get(self, request):
+        params = SyncFeedSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        context = {"compact": params.validated_data["compact"]}
+
+        paginator = SyncCursorPagination()
+        changes = paginator.paginate_changes(ChangeFeed.changes, request, view=self)
+
+        by_stream = {"projects": [], "places": [], "deleted": []}
+        for stream, row in changes:
+            by_stream[stream].append(row)
+        refresh_stale_places(by_stream["places"])
+        return paginator.get_paginated_response({
+            "projects": serialize(SyncProjectSerializer(by_stream["projects"], many=True)),
+            "places": serialize(SyncPlaceSerializer(by_stream["places"], many=True, context=context)),
+            "deleted": serialize(SyncTombstoneSerializer(by_stream["deleted"], many=True)),
+        })
 
 
 class ProjectListCreateAPIView(APIView):
     """
-    GET  /api/projects/       -> list
+    GET  /api/projects/       -> list (newest first, cursor-paginated)
     POST /api/projects/       -> create (your existing logic)
+
+    List filters: ?is_completed=true|false, ?start_date_after=YYYY-MM-DD, ?start_date_before=YYYY-MM-DD
     """
 
-    def get(self, request, pk: int):
-        project = get_object_or_404(Project, pk=pk)
-        return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
+    @extend_schema(parameters=[ProjectListFilterSerializer], responses=ProjectSerializer(many=True))
+    def get(self, request):
+        filters = ProjectListFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        qs = Project.objects.with_places()
+        if params["is_completed"] is not None:
+            qs = qs.filter(is_completed=params["is_completed"])
+        if "start_date_after" in params:
+            qs = qs.filter(start_date__gte=params["start_date_after"])
+        if "start_date_before" in params:
+            qs = qs.filter(start_date__lte=params["start_date_before"])
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        refresh_stale_places(place for project in page for place in project.project_artworks.all())
+        context = {"compact": params["compact"]}
+        return paginator.get_paginated_response(serialize(ProjectSerializer(page, many=True, context=context)))
 
     def post(self, request):
         serializer = ProjectCreateSerializer(data=request.data)
@@ -35,44 +267,83 @@ class ProjectListCreateAPIView(APIView):
 
         artwork_ids = data["artwork_ids"]
 
-        existing = Artwork.objects.filter(external_id__in=artwork_ids)
-        existing_map = {a.external_id: a for a in existing}
-
-        missing_ids = [aid for aid in artwork_ids if aid not in existing_map]
-
-        # Fetch missing from Art Institute API
-        created_artworks, fetch_errors = ArtworkService.fetch_missing_artworks(missing_ids)
+        by_external, fetch_errors = ArtworkService.get_artworks(artwork_ids)
+        ordered_artworks = [by_external[aid] for aid in artwork_ids if aid in by_external]
 
         with transaction.atomic():
-            if created_artworks:
-                Artwork.objects.bulk_create(created_artworks, ignore_conflicts=True)
-
-            artworks = list(Artwork.objects.filter(external_id__in=artwork_ids))
-            by_external = {a.external_id: a for a in artworks}
-
-            ordered_artworks = [by_external[aid] for aid in artwork_ids if aid in by_external]
-
-            project = Project.objects.create(
+            project = ProjectService.create_project(
                 name=data["name"],
                 description=data.get("description"),
                 start_date=data.get("start_date"),
+                artworks=ordered_artworks,
             )
-            links = [
-                ProjectArtwork(
-                    project=project,
-                    artwork=artwork,
-                )
-                for artwork in ordered_artworks
-            ]
-            ProjectArtwork.objects.bulk_create(links, ignore_conflicts=True)
 
-        response_payload = ProjectSerializer(project).data
+        project = Project.objects.with_places().get(pk=project.pk)
+        response_payload = serialize(ProjectSerializer(project))
         if fetch_errors:
             response_payload["fetch_errors"] = fetch_errors
 
         return Response(response_payload, status=status.HTTP_201_CREATED)
 
 
+class ProjectBulkCreateAPIView(APIView):
+    """
+    POST /api/projects/bulk/
+    Body: JSON array of project definitions, as for POST /api/projects/,
+    or NDJSON (Content-Type: application/x-ndjson) with one per line.
+
+    Every valid definition is created; invalid ones are reported by index, without
+    aborting the rest. 201 if anything was created, else 400.
+    """
+    parser_classes = [JSONParser, NDJSONParser]
+    MAX_ITEMS = 1000
+
+    @extend_schema(request=ProjectCreateSerializer(many=True))
+    def post(self, request):
+        records = request.data
+        if not isinstance(records, list):
+            return Response({"detail": "Expected a list of projects."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(records) > self.MAX_ITEMS:
+            return Response(
+                {"detail": f"At most {self.MAX_ITEMS} projects per request; use `manage.py import_projects` for more."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        valid, errors = validate_each(ProjectCreateSerializer, records)
+        created = ProjectService.bulk_create_projects([data for _, data in valid])
+
+        results = errors + [
+            {"index": index, "id": project.pk, **({"fetch_errors": fetch_errors} if fetch_errors else {})}
+            for (index, _), (project, fetch_errors) in zip(valid, created)
+        ]
+        results.sort(key=lambda result: result["index"])
+        return Response(
+            {"created": len(created), "failed": len(errors), "results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class ProjectExportAPIView(APIView):
+    """
+    GET /api/projects/export/?output=ndjson|csv
+    Every project with its places, streamed (see api.export).
+    """
+    CHUNK_SIZE = 1000
+
+    @extend_schema(parameters=[ProjectExportSerializer], responses={200: str})
+    def get(self, request):
+        params = ProjectExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output_format = params.validated_data["output"]
+
+        response = StreamingHttpResponse(
+            export.export_projects(output_format, chunk_size=self.CHUNK_SIZE),
+            content_type=export.CONTENT_TYPES[output_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="projects.{output_format}"'
+        return response
+
+
 class ProjectDetailAPIView(APIView):
     """
     GET    /api/projects/<id>/  -> single
@@ -80,27 +351,47 @@ class ProjectDetailAPIView(APIView):
     DELETE /api/projects/<id>/  -> delete if no visited places
     """
 
+    @extend_schema(parameters=[CompactModeSerializer], responses=ProjectSerializer)
     def get(self, request, pk: int):
-        project = get_object_or_404(Project, pk=pk)
-        return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
+        compact = compact_mode(request)
+
+        def render():
+            if settings.FAST_READ_SERIALIZERS:
+                return fast_serializers.project_data(pk, compact=compact)
+            project = get_object_or_404(Project.objects.with_places(), pk=pk)
+            refresh_stale_places(project.project_artworks.all())
+            return serialize(ProjectSerializer(project, context={"compact": compact}))
+
+        return conditional_project_response(request, pk, "detail", render, compact=compact)
 
     def patch(self, request, pk: int):
-        project = get_object_or_404(Project, pk=pk)
-        serializer = ProjectUpdateSerializer(project, data=request.data, partial=True)
+        """Honors If-Match with the project's detail ETag: 412 if the project changed since."""
+        version, places_version, token = get_project_state(pk)
+        etag = project_etag(pk, token, "detail")
+        if precondition_failed(request, etag):
+            return precondition_failed_response(etag)
+
+        serializer = ProjectUpdateSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
+
+        # With If-Match the write must not land on a state the client hasn't seen
+        expected = (version, places_version) if "If-Match" in request.headers else None
+        if not ProjectService.update_project(pk, fields=serializer.validated_data, expected=expected):
+            return precondition_failed_response(etag)
+
+        project = Project.objects.with_places().get(pk=pk)
+        return Response(serialize(ProjectSerializer(project)), status=status.HTTP_200_OK)
 
     def delete(self, request, pk: int):
         project = get_object_or_404(Project, pk=pk)
 
-        if ProjectArtwork.objects.filter(project=project, visited=True).exists():
+        if project.visited_count:
             return Response(
                 {"detail": "Project cannot be deleted because it has visited places."},
                 status=status.HTTP_409_CONFLICT,
             )
 
-        project.delete()
+        ProjectService.delete_project(project)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -118,21 +409,16 @@ class ProjectAddArtworkAPIView(APIView):
         serializer.is_valid(raise_exception=True)
         external_id = serializer.validated_data["artwork_id"]
 
-        artwork = Artwork.objects.filter(external_id=external_id).first()
+        by_external, fetch_errors = ArtworkService.get_artworks([external_id])
+        artwork = by_external.get(external_id)
         if not artwork:
-            created_artworks, fetch_errors = ArtworkService.fetch_missing_artworks([external_id])
-
-            if fetch_errors or not created_artworks:
-                return Response(
-                    {
-                        "detail": "Artwork does not exist in third-party API or could not be fetched.",
-                        "errors": fetch_errors,
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            Artwork.objects.bulk_create(created_artworks, ignore_conflicts=True)
-            artwork = Artwork.objects.get(external_id=external_id)
+            return Response(
+                {
+                    "detail": "Artwork does not exist in third-party API or could not be fetched.",
+                    "errors": fetch_errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         with transaction.atomic():
             try:
@@ -143,8 +429,9 @@ class ProjectAddArtworkAPIView(APIView):
             except ValueError as e:
                 return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
 
-        payload = ProjectSerializer(project).data
-        payload["added"] = {"external_id": artwork.external_id, "created_link": True}
+        project = Project.objects.with_places().get(pk=project.pk)
+        payload = serialize(ProjectSerializer(project))
+        payload["added"] = {"external_id": artwork.external_id, "created_link": created}
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
@@ -158,77 +445,127 @@ class ProjectArtworkUpdateAPIView(APIView):
     Extra logic:
     - If all places in the project are visited => project.is_completed=True (+ completed_at)
     - Otherwise => project.is_completed=False (+ completed_at=None)
+
+    Optimistic: the place is written with one conditional UPDATE on its version, and the
+    project row is only locked when `visited` flips. Send If-Match with the place's ETag
+    (from GET or a previous PATCH) to get 412 instead of overwriting someone else's change.
     """
+    MAX_ATTEMPTS = 3
 
     def patch(self, request, project_id: int, artwork_id: int):
         serializer = ProjectArtworkUpdateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        payload = serializer.validated_data
-
-        with transaction.atomic():
-            project = get_object_or_404(Project.objects.select_for_update(), pk=project_id)
-            artwork = get_object_or_404(Artwork, external_id=artwork_id)
-
-            link = get_object_or_404(
-                ProjectArtwork.objects.select_for_update(),
-                project=project,
-                artwork=artwork,
+        changes = {field: serializer.validated_data[field] for field in ("notes", "visited") if field in serializer.validated_data}
+
+        for _ in range(self.MAX_ATTEMPTS):
+            link_id, version, visited, etag = get_place_state(project_id, artwork_id)
+            if precondition_failed(request, etag):
+                return precondition_failed_response(etag)
+
+            with transaction.atomic():
+                if ProjectArtworkService.update_place(
+                    project_id=project_id, link_id=link_id, version=version, visited=visited, changes=changes,
+                ):
+                    break
+
+            # Changed between the read and the write: the client's If-Match no longer holds,
+            # and without one, re-read and apply the change on top
+            if "If-Match" in request.headers:
+                return precondition_failed_response(get_place_state(project_id, artwork_id)[3])
+        else:
+            return Response(
+                {"detail": "The place is being changed concurrently; retry."},
+                status=status.HTTP_409_CONFLICT,
             )
 
-            visited_changed = False
+        project = Project.objects.with_places().get(pk=project_id)
+        return Response(
+            serialize(ProjectSerializer(project)),
+            status=status.HTTP_200_OK,
+            headers={"ETag": get_place_state(project_id, artwork_id)[3]},
+        )
 
-            if "notes" in payload:
-                link.notes = payload["notes"]
 
-            if "visited" in payload:
-                new_visited = payload["visited"]
-                visited_changed = (link.visited != new_visited)
-                link.visited = new_visited
+@extend_schema(tags=["Artwork (Places)"])
+class ProjectArtworkBulkUpdateAPIView(APIView):
+    """
+    PATCH /api/projects/<project_id>/artworks/bulk/
+    Body: [ { "artwork_id": 123, "notes": "...", "visited": true }, ... ]
+    Applies all updates in one transaction and recomputes completion once.
+    artwork_id = Artwork.external_id
+    """
 
-            link.save(update_fields=["notes", "visited"])
+    @extend_schema(request=ProjectArtworkBulkUpdateListSerializer, responses=ProjectSerializer)
+    def patch(self, request, project_id: int):
+        serializer = ProjectArtworkBulkUpdateListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-            if visited_changed:
-                project = ProjectService.sync_completion(project_id=project.id)
+        with transaction.atomic():
+            project = get_object_or_404(Project, pk=project_id)
+            try:
+                ProjectArtworkService.bulk_update_places(project=project, updates=serializer.validated_data)
+            except ValueError as e:
+                return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
+        project = Project.objects.with_places().get(pk=project_id)
+        return Response(serialize(ProjectSerializer(project)), status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=["Artwork (Places)"])
-class ProjectArtworkListAPIView(APIView):
+class ProjectArtworkListAPIView(ProjectAddArtworkAPIView):
     """
     GET /api/projects/<project_id>/artworks/
     Lists all places/artworks in a project, including notes + visited.
+
+    Shares its URL with ProjectAddArtworkAPIView, whose POST it inherits.
     """
 
+    @extend_schema(parameters=[CompactModeSerializer], responses=ProjectArtworkSerializer(many=True))
     def get(self, request, project_id: int):
-        project = get_object_or_404(Project, pk=project_id)
-
-        qs = (
-            ProjectArtwork.objects
-            .filter(project=project)
-            .select_related("artwork")
-            .order_by("id")
-        )
+        compact = compact_mode(request)
+
+        def render():
+            if settings.FAST_READ_SERIALIZERS:
+                return fast_serializers.places_data(project_id, compact=compact)
+            qs = (
+                ProjectArtwork.objects
+                .with_artwork()
+                .filter(project_id=project_id)
+                .order_by("id")
+            )
+            refresh_stale_places(qs)
+            return serialize(ProjectArtworkSerializer(qs, many=True, context={"compact": compact}))
 
-        return Response(ProjectArtworkSerializer(qs, many=True).data, status=status.HTTP_200_OK)
+        return conditional_project_response(request, project_id, "places", render, compact=compact)
 
 
 @extend_schema(tags=["Artwork (Places)"])
-class ProjectArtworkDetailAPIView(APIView):
+class ProjectArtworkDetailAPIView(ProjectArtworkUpdateAPIView):
     """
     GET /api/projects/<project_id>/artworks/<artwork_id>/
     Returns a single place/artwork within the project.
     artwork_id = Artwork.external_id
+
+    Shares its URL with ProjectArtworkUpdateAPIView, whose PATCH it inherits.
     """
 
+    @extend_schema(parameters=[CompactModeSerializer], responses=ProjectArtworkSerializer)
     def get(self, request, project_id: int, artwork_id: int):
-        project = get_object_or_404(Project, pk=project_id)
-        artwork = get_object_or_404(Artwork, external_id=artwork_id)
+        compact = compact_mode(request)
 
-        link = get_object_or_404(
-            ProjectArtwork.objects.select_related("artwork"),
-            project=project,
-            artwork=artwork,
-        )
-
-        return Response(ProjectArtworkSerializer(link).data, status=status.HTTP_200_OK)
\ No newline at end of file
+        def render():
+            if settings.FAST_READ_SERIALIZERS:
+                return fast_serializers.place_data(project_id, artwork_id, compact=compact)
+            link = get_object_or_404(
+                ProjectArtwork.objects.with_artwork(),
+                project_id=project_id,
+                artwork__external_id=artwork_id,
+            )
+            refresh_stale_places([link])
+            return serialize(ProjectArtworkSerializer(link, context={"compact": compact}))
+
+        _, _, _, etag = get_place_state(project_id, artwork_id)
+        if compact:
+            etag = compact_etag(etag)
+        # The place's ETag is the cache version: notes edits to other places don't evict it
+        return conditional_response(request, etag, (project_id, etag, f"place-{artwork_id}"), render)
@@ -0,0 +1,76 @@
+"""
+Compare two benchmark result files, e.g. from the base branch and from a change.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/change.json --fail-over 10
+
+Regressions (slower latency, lower throughput, more queries per request) beyond
+--threshold percent are marked; with --fail-over the exit status is 1 if any
+regression exceeds that many percent.
+"""
+import argparse
+import json
+import sys
+
+# (label, path into a scenario's results, True if higher is better)
+METRICS = [
+    ("throughput req/s", ("throughput_rps",), True),
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p95 ms", ("latency_ms", "p95"), False),
+    ("p99 ms", ("latency_ms", "p99"), False),
+    ("queries/request", ("queries_per_request", "mean"), False),
+]
+
+
+def lookup(results, path):
+    for key in path:
+        results = (results or {}).get(key)
+    return results
+
+
+def change_pct(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", type=argparse.FileType())
+    parser.add_argument("change", type=argparse.FileType())
+    parser.add_argument("--threshold", type=float, default=5.0, help="Percent change worth marking")
+    parser.add_argument("--fail-over", type=float, help="Exit with 1 if a regression exceeds this percent")
+    args = parser.parse_args()
+
+    base, change = json.load(args.base), json.load(args.change)
+    print(f"base:   {base['meta']['commit']} ({base['meta']['timestamp']})")
+    print(f"change: {change['meta']['commit']} ({change['meta']['timestamp']})")
+    for key in ("config", "stub", "database"):
+        if base["meta"].get(key) != change["meta"].get(key):
+            print(f"warning: runs differ in {key}; numbers may not be comparable")
+
+    worst = 0.0
+    for scenario in sorted(set(base["scenarios"]) & set(change["scenarios"])):
+        print(f"\n{scenario}")
+        for label, path, higher_is_better in METRICS:
+            old = lookup(base["scenarios"][scenario], path)
+            new = lookup(change["scenarios"][scenario], path)
+            pct = change_pct(old, new)
+
+            mark = ""
+            if pct is not None:
+                regression = -pct if higher_is_better else pct
+                worst = max(worst, regression)
+                if regression >= args.threshold:
+                    mark = "  <- regression"
+                elif regression <= -args.threshold:
+                    mark = "  <- improvement"
+            pct_text = "n/a" if pct is None else f"{pct:+.1f}%"
+            print(f"  {label:<18} {old!s:>10} -> {new!s:>10}  {pct_text:>8}{mark}")
+
+    if args.fail_over is not None and worst > args.fail_over:
+        print(f"\nWorst regression {worst:.1f}% exceeds {args.fail_over:g}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Load driver for the API hot paths: project create, add place, bulk visit toggles
+and detail reads.
+
+Each scenario runs for --duration seconds (after --warmup) at --concurrency, against
+a server at --base-url, or with --serve against a uvicorn server and stub upstream
+started here. Projects are sampled from the database the server uses, so run it with
+the same DB_* environment. Queries per request come from the Server-Timing header.
+
+    python -m benchmarks.run --serve --concurrency 16 --latency-ms 150
+
+Results are written as JSON to benchmarks/results/ (see benchmarks.compare).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+import requests
+
+from .stub_artic import add_stub_arguments, start_stub, stub_config_from_args
+
+SCENARIOS = ("create", "add_place", "bulk_visit", "detail")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+ROOT = Path(__file__).resolve().parent.parent
+
+SERVER_TIMING = re.compile(r'(\w+);dur=[\d.]+;desc="(\d+) calls"')
+
+
+class Workload:
+    """Builds one request per call for a scenario, from a sample of seeded projects."""
+
+    def __init__(self, base_url, projects, pool_max, new_artwork_rate, rng):
+        self.base_url = base_url.rstrip("/")
+        self.projects = projects
+        self.pool_max = pool_max
+        self.new_artwork_rate = new_artwork_rate
+        self.rng = rng
+
+    def artwork_id(self):
+        if self.rng.random() < self.new_artwork_rate:
+            # Far outside the seeded pool: unknown locally, so it goes to the upstream
+            return self.rng.randint(self.pool_max + 1, self.pool_max + 10_000_000)
+        return self.rng.randint(1, self.pool_max)
+
+    def create(self, session):
+        ids = [self.artwork_id() for _ in range(self.rng.randint(1, 10))]
+        return session.post(
+            f"{self.base_url}/api/projects/",
+            json={"name": "Benchmark tour", "artwork_ids": ids},
+        )
+
+    def add_place(self, session):
+        pk, _ = self.rng.choice(self.projects)
+        return session.post(f"{self.base_url}/api/projects/{pk}/artworks/", json={"artwork_id": self.artwork_id()})
+
+    def bulk_visit(self, session):
+        pk, artwork_ids = self.rng.choice(self.projects)
+        chosen = self.rng.sample(artwork_ids, self.rng.randint(1, len(artwork_ids)))
+        return session.patch(
+            f"{self.base_url}/api/projects/{pk}/artworks/bulk/",
+            json=[{"artwork_id": aid, "visited": self.rng.random() < 0.5} for aid in chosen],
+        )
+
+    def detail(self, session):
+        pk, _ = self.rng.choice(self.projects)
+        return session.get(f"{self.base_url}/api/projects/{pk}/")
+
+
+def sample_projects(size, rng):
+    """(project id, place external ids) for up to `size` random seeded projects."""
+    from django.db.models import Max, Min
+
+    from api.models import Artwork, Project
+
+    bounds = Project.objects.aggregate(low=Min("id"), high=Max("id"))
+    pool_max = Artwork.objects.aggregate(high=Max("external_id"))["high"] or 0
+    if bounds["low"] is None:
+        raise SystemExit("No projects in the database; run python -m benchmarks.seed first.")
+
+    ids = {rng.randint(bounds["low"], bounds["high"]) for _ in range(size)}
+    projects = [
+        (p.pk, [link.artwork.external_id for link in p.project_artworks.all()])
+        for p in Project.objects.with_places().filter(pk__in=ids)
+    ]
+    return [p for p in projects if p[1]], pool_max
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return round(sorted_values[index], 2)
+
+
+def run_scenario(name, workload_factory, concurrency, duration, warmup):
+    samples = []
+    lock = threading.Lock()
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+
+    def worker(index):
+        workload = workload_factory(index)
+        session = requests.Session()
+        local = []
+        while (now := time.monotonic()) < stop_at:
+            started = time.perf_counter()
+            try:
+                response = getattr(workload, name)(session)
+                status, timing = response.status_code, response.headers.get("Server-Timing", "")
+            except requests.RequestException:
+                status, timing = None, ""
+            latency = time.perf_counter() - started
+            if now >= measure_from:
+                counts = {component: int(calls) for component, calls in SERVER_TIMING.findall(timing)}
+                local.append((latency, status, counts.get("db", 0), counts.get("upstream", 0)))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    queries = sorted(s[2] for s in samples)
+    statuses = {}
+    for _, status, _, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    count = len(samples)
+    return {
+        "requests": count,
+        "throughput_rps": round(count / duration, 2),
+        "errors": sum(1 for s in samples if s[1] is None or s[1] >= 500),
+        "status_counts": statuses,
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 2) if count else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / count, 2) if count else None,
+            "p95": percentile(queries, 95),
+            "max": queries[-1] if queries else None,
+        },
+        "upstream_calls_per_request": round(sum(s[3] for s in samples) / count, 3) if count else None,
+    }
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(stub_url, workers):
+    port = free_port()
+    env = {**os.environ, "ARTIC_API_BASE": stub_url, "API_LOG_LEVEL": "ERROR"}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "config.asgi:application",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/metrics", timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            if process.poll() is not None:
+                raise SystemExit("Server exited during startup.")
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Server did not start within 30s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--sample-size", type=int, default=5_000, help="Seeded projects to draw requests from")
+    parser.add_argument("--new-artwork-rate", type=float, default=0.2, help="Share of artwork ids unknown locally")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="Start a stub upstream and a uvicorn server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --serve")
+    parser.add_argument("--label", default="", help="Added to the result file name")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<time>-<commit>.json)")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+    from django.db import connection
+
+    rng = random.Random(args.seed)
+    projects, pool_max = sample_projects(args.sample_size, rng)
+    connection.close()
+
+    server = stub = None
+    base_url = args.base_url
+    if args.serve:
+        stub, stub_url = start_stub(config=stub_config_from_args(args))
+        server, base_url = start_server(stub_url, args.workers)
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            def workload_factory(index, name=name):
+                rng = random.Random(f"{args.seed}-{name}-{index}")
+                return Workload(base_url, projects, pool_max, args.new_artwork_rate, rng)
+
+            print(f"{name}: {args.concurrency} clients for {args.duration:g}s ...", flush=True)
+            results[name] = run_scenario(name, workload_factory, args.concurrency, args.duration, args.warmup)
+            r = results[name]
+            print(
+                f"  {r['throughput_rps']} req/s, p50 {r['latency_ms']['p50']:.1f} ms, "
+                f"p95 {r['latency_ms']['p95']:.1f} ms, p99 {r['latency_ms']['p99']:.1f} ms, "
+                f"{r['queries_per_request']['mean']} queries/request, statuses {r['status_counts']}"
+                if r["requests"] else "  no requests completed",
+                flush=True,
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if stub is not None:
+            stub.shutdown()
+
+    commit = git("rev-parse", "--short", "HEAD")
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "base_url": base_url,
+            "served": args.serve,
+            "config": {
+                key: getattr(args, key)
+                for key in ("concurrency", "duration", "warmup", "sample_size", "new_artwork_rate", "seed", "workers")
+            },
+            "stub": stub_config_from_args(args).as_dict() if args.serve else None,
+            "sampled_projects": len(projects),
+        },
+        "scenarios": results,
+    }
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / ("-".join(filter(None, [stamp, commit or "nogit", args.label])) + ".json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Fill the configured database with benchmark data: an artwork pool and projects with
+1-10 places each, with consistent place counters.
+
+    DB_NAME=/tmp/bench.sqlite3 python manage.py migrate
+    DB_NAME=/tmp/bench.sqlite3 python -m benchmarks.seed --projects 100000
+
+Use a dedicated database; rows are added to whatever is already there. The same
+--seed produces the same data. Rows are written with executemany rather than
+bulk_create, which spends most of its time building model instances and SQL at
+these volumes; columns the generator doesn't set get their model defaults.
+"""
+import argparse
+import os
+import random
+import time
+
+import django
+
+
+def insert_rows(model, rows, now):
+    """
+    INSERT rows (dicts of attname -> DB-ready value, same keys in each) into model's table.
+    Other concrete fields get their default, or `now` for auto_now/auto_now_add fields.
+    """
+    from django.db import connection
+
+    if not rows:
+        return
+    given = list(rows[0])
+    constants = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in given or (field.primary_key and field.attname not in given):
+            continue
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            value = now
+        elif field.has_default():
+            value = field.get_default()
+        else:
+            value = None
+        constants[field.column] = field.get_db_prep_save(value, connection)
+
+    columns = [model._meta.get_field(name).column for name in given] + list(constants)
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        connection.ops.quote_name(model._meta.db_table),
+        ", ".join(connection.ops.quote_name(c) for c in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    tail = list(constants.values())
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [[row[name] for name in given] + tail for row in rows])
+
+
+def seed(projects, artworks, chunk_size, rng, out=print):
+    from django.core.management.color import no_style
+    from django.db import connection, transaction
+    from django.db.models import Max
+    from django.utils import timezone
+
+    from api.licenses import license_for, save_licenses
+    from api.models import Artwork, Project, ProjectArtwork
+
+    now = timezone.now()
+    license = license_for("Seed license (CC0)")
+
+    start_id = (Artwork.objects.aggregate(high=Max("external_id"))["high"] or 0) + 1
+    with transaction.atomic():
+        save_licenses([license])
+        insert_rows(
+            Artwork,
+            [
+                {
+                    "external_id": aid,
+                    "title": f"Seed artwork {aid}",
+                    "license_id": license.id,
+                    "fetched_at": now,
+                }
+                for aid in range(start_id, start_id + artworks)
+            ],
+            now,
+        )
+    pool = list(Artwork.objects.filter(external_id__gte=start_id).values_list("id", flat=True))
+    out(f"{len(pool)} artworks")
+
+    next_id = (Project.objects.aggregate(high=Max("id"))["high"] or 0) + 1
+    started = time.monotonic()
+    done = 0
+    while done < projects:
+        size = min(chunk_size, projects - done)
+        project_rows, link_rows = [], []
+        for pk in range(next_id, next_id + size):
+            chosen = rng.sample(pool, rng.randint(1, 10))
+            visited = [rng.random() < 0.3 for _ in chosen]
+            project_rows.append({
+                "id": pk,
+                "name": f"Benchmark tour {pk}",
+                "description": "Seeded for benchmarks",
+                "places_count": len(chosen),
+                "visited_count": sum(visited),
+                "is_completed": all(visited),
+            })
+            link_rows.extend(
+                {"project_id": pk, "artwork_id": artwork_id, "visited": flag}
+                for artwork_id, flag in zip(chosen, visited)
+            )
+
+        with transaction.atomic():
+            insert_rows(Project, project_rows, now)
+            insert_rows(ProjectArtwork, link_rows, now)
+
+        next_id += size
+        done += size
+        elapsed = time.monotonic() - started
+        out(f"{done} projects ({done / elapsed:,.0f}/s)")
+
+    # Explicit ids bypass the PostgreSQL sequence; move it past them
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Project]):
+            cursor.execute(sql)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--artworks", type=int, default=20_000, help="Size of the artwork pool places are drawn from")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+    seed(args.projects, args.artworks, args.chunk_size, random.Random(args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Local stand-in for the Art Institute artworks API, for benchmarks.
+
+Answers the multi-id requests ArticClient makes (GET /?ids=1,2,3&fields=...&limit=...)
+after a configurable delay, fails a configurable share of them, and leaves a fixed
+share of ids out of the response (the upstream's way of saying 404).
+
+    python -m benchmarks.stub_artic --port 8100 --latency-ms 150 --error-rate 0.02
+
+then point the API at it with ARTIC_API_BASE=http://127.0.0.1:8100.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubConfig:
+    def __init__(self, latency_ms=100.0, jitter_ms=20.0, error_rate=0.0, error_status=503, not_found_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.not_found_rate = not_found_rate
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StubConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        config = self.config
+        delay = max(0.0, random.gauss(config.latency_ms, config.jitter_ms)) / 1000
+        time.sleep(delay)
+
+        if random.random() < config.error_rate:
+            return self.respond(config.error_status, {"detail": "stub error"})
+
+        query = parse_qs(urlparse(self.path).query)
+        ids = [int(i) for i in query.get("ids", [""])[0].split(",") if i.strip().isdigit()]
+        # Deterministic per id, so a missing id stays missing across runs
+        cutoff = int(config.not_found_rate * 1000)
+        data = [{"id": aid, "title": f"Stub artwork {aid}"} for aid in ids if aid % 1000 >= cutoff]
+        self.respond(200, {"data": data, "info": {"license_text": "Stub license (CC0)"}})
+
+    def respond(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub(host="127.0.0.1", port=0, config=None):
+    """Serve the stub from a daemon thread. Returns (server, base_url); stop with server.shutdown()."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config or StubConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Mean upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="Share of ids the stub doesn't know")
+
+
+def stub_config_from_args(args):
+    return StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        not_found_rate=args.not_found_rate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_stub(args.host, args.port, stub_config_from_args(args))
+    print(f"Stub Art Institute API at {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,12 +79,63 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Configured from the environment:
+#   DB_ENGINE=sqlite (default)  - single-node deployments; tuned for concurrent readers + one writer
+#   DB_ENGINE=postgres          - everything else; DB_POOL=1 enables psycopg's connection pool
+
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("DB_NAME", "travel_planner"),
+            'USER': os.environ.get("DB_USER", "postgres"),
+            'PASSWORD': os.environ.get("DB_PASSWORD", ""),
+            'HOST': os.environ.get("DB_HOST", "localhost"),
+            'PORT': os.environ.get("DB_PORT", "5432"),
+            # Persistent connections, verified before reuse
+            'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if os.environ.get("DB_POOL", "0") == "1":
+        # The pool owns connection lifetime, so Django must not keep them itself
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            'max_size': int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            'timeout': int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        }
+elif DB_ENGINE == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("DB_NAME", BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # SQLite ignores select_for_update. BEGIN IMMEDIATE takes the write lock when
+                # transaction.atomic() starts instead, so read-check-write blocks can't interleave
+                'transaction_mode': 'IMMEDIATE',
+                # Seconds to wait for the write lock before "database is locked"
+                'timeout': int(os.environ.get("DB_BUSY_TIMEOUT", 20)),
+                # WAL lets readers proceed while a write is in progress
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=134217728;'
+                    'PRAGMA cache_size=-20000;'
+                ),
+            },
+            # The default in-memory test database can't be shared between threads;
+            # point this at a file to run the concurrency tests
+            'TEST': {
+                'NAME': os.environ.get("DB_TEST_NAME"),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE {DB_ENGINE!r}; use 'sqlite' or 'postgres'.")
 
 
 # Password validation
@@ -127,4 +182,84 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "Travel Planner API",
     "DESCRIPTION": "API documentation",
     "VERSION": "1.0.0",
-}
\ No newline at end of file
+}
+
+# Art Institute of Chicago API
+ARTIC_API_BASE = os.environ.get("ARTIC_API_BASE", "https://api.artic.edu/api/v1/artworks")
+
+# Project detail and place reads build their JSON from values_list() rows instead of DRF
+# serializers (api.fast_serializers); same bytes, a fraction of the CPU. False uses DRF.
+FAST_READ_SERIALIZERS = os.environ.get("FAST_READ_SERIALIZERS", "1") == "1"
+
+# Per-request instrumentation (api.instrumentation): Server-Timing headers, one JSON log line
+# per request on the "api.performance" logger, and the slowest queries of requests over SLOW_REQUEST_MS.
+PERFORMANCE = {
+    "SERVER_TIMING": True,
+    "LOG_REQUESTS": True,
+    "SLOW_REQUEST_MS": int(os.environ.get("SLOW_REQUEST_MS", 500)),
+    "SLOW_QUERY_LIMIT": 10,
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api": {
+            "handlers": ["console"],
+            "level": os.environ.get("API_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+# Circuit breaker around the Art Institute API: after MIN_CALLS calls within WINDOW seconds
+# fail at FAILURE_RATE or more, calls fail fast for OPEN_SECONDS before a probe is let through.
+ARTIC_CIRCUIT_BREAKER = {
+    "FAILURE_RATE": 0.5,
+    "MIN_CALLS": 5,
+    "WINDOW": 30,
+    "OPEN_SECONDS": 30,
+}
+
+# Token bucket for calls to the Art Institute API. A 429 halves RATE (down to MIN_RATE) and
+# pauses calls for its Retry-After; calls that would wait over MAX_QUEUE_WAIT seconds fail instead.
+ARTIC_RATE_LIMIT = {
+    "RATE": 10,
+    "BURST": 20,
+    "MIN_RATE": 0.5,
+    "MAX_QUEUE_WAIT": 2,
+}
+
+# Artwork metadata cache in front of the Artwork table and the upstream API.
+# Use "api.cache.DjangoArtworkCacheBackend" with OPTIONS {"alias": ...} to share it between workers.
+ARTWORK_CACHE = {
+    "BACKEND": "api.cache.LocMemArtworkCacheBackend",
+    "OPTIONS": {"max_entries": 10_000},
+    "TTL": 60 * 60,
+    "NEGATIVE_TTL": 5 * 60,
+}
+
+# Rendered project read responses, keyed by Project.version (see api.cache.ProjectResponseCache)
+PROJECT_RESPONSE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 5 * 60,
+}
+
+# Idempotency-Key on the create and add-place POSTs (see api.idempotency): successful responses
+# are replayed to retries for TTL seconds; a duplicate waits up to WAIT seconds for the original.
+IDEMPOTENCY = {
+    "TTL": 24 * 60 * 60,
+    "LOCK_TIMEOUT": 60,
+    "WAIT": 15,
+    "POLL_INTERVAL": 0.1,
+}
+
+# "sync": unknown artworks are fetched from the upstream before a write request returns.
+# "async": they are saved as pending placeholders and hydrated by `manage.py hydrate_artworks`.
+ARTWORK_HYDRATION_MODE = os.environ.get("ARTWORK_HYDRATION_MODE", "sync")
+
+# Artworks fetched more than this many seconds ago are served as they are, and refreshed
+# from the upstream in the background by `manage.py hydrate_artworks`. 0 disables refreshing.
+ARTWORK_REFRESH_TTL = int(os.environ.get("ARTWORK_REFRESH_TTL", 7 * 24 * 60 * 60))
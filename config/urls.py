@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from api.instrumentation import metrics_view
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -29,6 +30,9 @@ urlpatterns = [
     # Your API
     path("api/", include("api.urls")),
 
+    # Prometheus metrics of this worker process
+    path("metrics", metrics_view, name="metrics"),
+
     # OpenAPI schema (JSON)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
 